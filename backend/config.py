@@ -9,42 +9,107 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 UPLOAD_DIR = BASE_DIR / "uploads"
 EXPORT_DIR = BASE_DIR / "exports"
 
-# Ensure directories exist
-UPLOAD_DIR.mkdir(exist_ok=True)
-EXPORT_DIR.mkdir(exist_ok=True)
+# Directories are created on first use (see get_upload_dir/get_export_dir)
+_dirs_ready = False
+
+
+def _ensure_dirs() -> None:
+    """Create the upload and export directories once per process."""
+    global _dirs_ready
+    if not _dirs_ready:
+        UPLOAD_DIR.mkdir(exist_ok=True)
+        EXPORT_DIR.mkdir(exist_ok=True)
+        _dirs_ready = True
+
+
+def get_upload_dir() -> Path:
+    """Return the upload directory, creating it if needed."""
+    _ensure_dirs()
+    return UPLOAD_DIR
+
+
+def get_export_dir() -> Path:
+    """Return the export directory, creating it if needed."""
+    _ensure_dirs()
+    return EXPORT_DIR
+
 
 # File upload settings
 MAX_FILE_SIZE_MB = 20
 MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB * 1024 * 1024
 ALLOWED_EXTENSIONS = {".pdf"}
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # bytes per read/write while saving uploads
 
 # Processing settings
 AUTO_DELETE_AFTER_SECONDS = 3600  # 1 hour
+MAX_STORED_JOBS = 1000  # job results kept in memory (least recently used dropped first)
 ENABLE_OCR = True
 OCR_LANGUAGE = "eng"
 
 # Email validation settings
 ENABLE_DNS_LOOKUP = False  # Set to True for MX record validation
 DNS_TIMEOUT = 5  # seconds
+MX_CACHE_TTL = 900  # seconds a domain with a mail server stays cached
+MX_NEGATIVE_CACHE_TTL = 60  # seconds failed/unavailable lookups stay cached
+MX_CACHE_MAXSIZE = 10000  # domains kept (least recently used dropped first)
+MX_CACHE_FILE = Path.home() / ".cache" / "virus" / "mx_cache.json"
+MX_LOOKUP_WORKERS = 32  # concurrent MX lookups per validate_batch call
+DOMAIN_CHECK_CACHE_SIZE = 10000  # domains whose structure/TLD checks are kept
+VALIDATION_CACHE_SIZE = 65536  # addresses whose DNS-free results are kept
+
+# Email and domain lists below are lower-cased at load time, so lookups only
+# need to lower-case the address being checked.
 
 # Email blacklist - emails matching these patterns will be discarded
-EMAIL_BLACKLIST = [
+EMAIL_BLACKLIST = frozenset(s.lower() for s in (
     "test@test.com",
     "example@example.com",
     "admin@localhost",
     "noreply@localhost",
-]
+))
 
 # Domain blacklist - emails from these domains will be discarded
-DOMAIN_BLACKLIST = [
+DOMAIN_BLACKLIST = frozenset(s.lower() for s in (
     "localhost",
     "example.com",
     "test.com",
     "invalid.com",
-]
+))
+
+
+def _build_domain_trie(domains) -> dict:
+    """
+    Build a trie keyed on reversed domain labels.
+    
+    "mail.example.com" is stored as com -> example -> mail, with an empty-string
+    key marking the end of a blacklisted domain.
+    """
+    trie = {}
+    for domain in domains:
+        node = trie
+        for label in domain.split(".")[::-1]:
+            node = node.setdefault(label, {})
+        node[""] = True
+    return trie
+
+
+_DOMAIN_BLACKLIST_TRIE = _build_domain_trie(DOMAIN_BLACKLIST)
+
+
+def is_blacklisted_domain(domain: str) -> bool:
+    """Check whether a (lower-case) domain or any of its parents is blacklisted."""
+    node = _DOMAIN_BLACKLIST_TRIE
+    for label in domain.split(".")[::-1]:
+        node = node.get(label)
+        if node is None:
+            return False
+        if "" in node:
+            return True
+    return False
+
 
 # Known valid domains for confidence scoring
-KNOWN_VALID_DOMAINS = [
+KNOWN_VALID_DOMAINS = frozenset(s.lower() for s in (
     "gmail.com",
     "yahoo.com",
     "hotmail.com",
@@ -55,7 +120,7 @@ KNOWN_VALID_DOMAINS = [
     "mail.com",
     "zoho.com",
     "yandex.com",
-]
+))
 
 # Rate limiting
 RATE_LIMIT_REQUESTS = 10
@@ -3,12 +3,155 @@ Email Extractor Module
 Handles extraction of email addresses from text, including de-obfuscation
 and context awareness.
 """
+import os
 import re
+import string
 import logging
-from typing import Optional
+from concurrent.futures import Executor
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+# Opt-in: the third-party `regex` package accepts the same syntax and flags
+# (IGNORECASE, DOTALL, VERBOSE) as `re`. Off by default so matching does not
+# depend on what happens to be installed.
+_re_engine = re
+if os.getenv("PDF_EXTRACTOR_USE_REGEX_LIB") == "1":
+    try:
+        import regex as _re_engine
+    except ImportError:
+        pass
+
+if _re_engine is re:
+    try:
+        # Optional: google-re2 matches in linear time with a DFA engine
+        import re2 as _email_re
+    except ImportError:
+        _email_re = re
+else:
+    _email_re = _re_engine
 
 logger = logging.getLogger(__name__)
 
+# Local part, @, domain, dot, TLD (2+ chars). Kept free of backreferences and
+# inline flags so that both `re` and `re2` can compile it.
+EMAIL_PATTERN_STR = r'(?P<email>[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})'
+
+# Variant for backtracking engines (re, regex). A match may only start where a
+# local-part run starts, and the local part is capped at 64 chars (longer ones
+# never validate), so a long run without "@" is scanned once instead of once
+# per start position. Leading dots (e.g. a dot leader "Sales ....john@acme.com")
+# are skipped outside the group, as _normalize_email strips them anyway. RE2
+# is linear already and has no lookbehind.
+EMAIL_PATTERN_GUARDED_STR = (
+    r'(?<![a-zA-Z0-9._%+\-])\.*'
+    r'(?P<email>[a-zA-Z0-9._%+\-]{1,64}@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})'
+)
+_EMAIL_SOURCE = EMAIL_PATTERN_STR if _email_re.__name__ == 're2' else EMAIL_PATTERN_GUARDED_STR
+
+class EmailMatch(NamedTuple):
+    """An email found in text, with hints taken from its surroundings."""
+    email: str
+    raw_email: str
+    context: Optional[str]
+    name_hint: Optional[str]
+    company_hint: Optional[str]
+
+
+# Characters the IGNORECASE hint patterns can start on: ASCII letters plus the
+# non-ASCII code points that case-fold onto them (İ, ı, ſ, Kelvin sign).
+# Context without any of these cannot yield a name or company hint.
+HINT_LETTERS = frozenset(string.ascii_letters + '\u0130\u0131\u017f\u212a')
+
+
+# Free email providers whose domain says nothing about the company
+COMMON_PROVIDERS = frozenset({
+    'gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com',
+    'icloud.com', 'aol.com', 'mail.com', 'protonmail.com'
+})
+
+
+@lru_cache(maxsize=4096)
+def _domain_to_company(domain: str) -> Optional[str]:
+    """
+    Infer a company name from an email domain (cached per domain).
+    
+    E.g., "acme-widgets.com" -> "Acme Widgets". Common email providers
+    yield None.
+    """
+    if domain in COMMON_PROVIDERS:
+        return None
+    
+    company_part = domain.split('.')[0]
+    if len(company_part) > 2:
+        return company_part.replace('-', ' ').replace('_', ' ').title()
+    
+    return None
+
+
+def _bytes_source(source: str) -> bytes:
+    """
+    Encode a str pattern for bytes input.
+    
+    In bytes mode the whitespace class leaves out the ASCII separators
+    0x1c-0x1f that str mode includes, so they are added back to keep both
+    modes in agreement on ASCII text. Only valid for patterns that use the
+    whitespace class outside character sets.
+    """
+    return source.replace(r'\s', r'[\s\x1c-\x1f]').encode('ascii')
+
+
+# Bytes matched by the whitespace class of _bytes_source patterns
+BYTES_WHITESPACE = frozenset(b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f')
+
+
+def _with_context(matches: list, length: int, context_chars: int):
+    """
+    Yield (match, before_start, after_end) for each email match.
+    
+    The context window reaches up to context_chars either side of the email
+    but stops at the neighbouring matches, so one address's name and company
+    hints never come from another address's surroundings.
+    """
+    prev_end = 0
+    last = len(matches) - 1
+    for i, match in enumerate(matches):
+        start, end = match.span('email')
+        next_start = matches[i + 1].start() if i < last else length
+        yield match, max(prev_end, start - context_chars), min(next_start, end + context_chars)
+        prev_end = match.end()
+
+
+def _compile_obfuscation(replacements: list, groups: dict, as_bytes: bool = False) -> tuple:
+    """
+    Fuse obfuscation patterns into one alternation so the text is scanned once.
+    
+    Patterns sharing a replacement become one named group; the matched group
+    name (match.lastgroup) maps back to the replacement.
+    A literal automaton (e.g. Aho-Corasick) can't replace this: tokens like
+    "[ at ]" allow whitespace inside and around the brackets.
+    
+    With as_bytes=True the same pattern is compiled for bytes input and the
+    replacements are ASCII bytes.
+    
+    Returns:
+        (compiled pattern, {group name: replacement})
+    """
+    branches = {}
+    for pattern, replacement in replacements:
+        branches.setdefault(replacement, []).append(pattern)
+    
+    source = '|'.join(
+        f"(?P<{groups[replacement]}>{'|'.join(patterns)})"
+        for replacement, patterns in branches.items()
+    )
+    if as_bytes:
+        combined = _re_engine.compile(_bytes_source(source), re.IGNORECASE)
+        by_group = {groups[replacement]: replacement.encode('ascii') for replacement in branches}
+    else:
+        combined = _re_engine.compile(source, re.IGNORECASE)
+        by_group = {groups[replacement]: replacement for replacement in branches}
+    return combined, by_group
+
 
 class EmailExtractor:
     """
@@ -16,62 +159,49 @@ class EmailExtractor:
     and context extraction.
     """
     
-    # Comprehensive email regex pattern
-    EMAIL_PATTERN = re.compile(
-        r'''
-        (?P<email>
-            [a-zA-Z0-9._%+\-]+      # Local part
-            @                        # @ symbol
-            [a-zA-Z0-9.\-]+         # Domain
-            \.                       # Dot
-            [a-zA-Z]{2,}            # TLD (2+ chars)
-        )
-        ''',
-        re.VERBOSE | re.IGNORECASE
-    )
+    # Comprehensive email regex pattern (RE2, or `regex` when opted in)
+    EMAIL_PATTERN = _email_re.compile(_EMAIL_SOURCE)
     
-    # Pattern to capture email with surrounding context
-    EMAIL_WITH_CONTEXT_PATTERN = re.compile(
-        r'''
-        (?P<context_before>.{0,100}?)   # Up to 100 chars before
-        (?P<email>
-            [a-zA-Z0-9._%+\-]+
-            @
-            [a-zA-Z0-9.\-]+
-            \.
-            [a-zA-Z]{2,}
-        )
-        (?P<context_after>.{0,100}?)    # Up to 100 chars after
-        ''',
-        re.VERBOSE | re.IGNORECASE | re.DOTALL
+    # Same pattern for text that arrives as bytes (see extract_emails_bytes)
+    EMAIL_PATTERN_B = _email_re.compile(_EMAIL_SOURCE.encode('ascii'))
+    
+    # Sanity check for normalized (lowercased) candidates: 5-254 chars overall,
+    # a 1-64 char local part, and a dotted domain ending in an alphabetic TLD
+    VALIDATE_PATTERN = re.compile(
+        r'(?=.{5,254}\Z)[a-z0-9._%+\-]{1,64}@[a-z0-9.\-]+\.[a-z]{2,}',
+        re.DOTALL
     )
     
+    # Characters of surrounding text kept on each side of an email
+    CONTEXT_CHARS = 100
+    
     # Obfuscation patterns to normalize
     OBFUSCATION_REPLACEMENTS = [
-        # @ symbol variants
-        (r'\s*\[\s*at\s*\]\s*', '@'),
-        (r'\s*\(\s*at\s*\)\s*', '@'),
-        (r'\s*\{\s*at\s*\}\s*', '@'),
+        # @ symbol variants: [at], (at), {at}, <at>
+        (r'\s*[\[\(\{<]\s*at\s*[\]\)\}>]\s*', '@'),
         (r'\s+at\s+', '@'),
-        (r'\s*<\s*at\s*>\s*', '@'),
         (r'\s*@\s*', '@'),
         
-        # Dot variants
-        (r'\s*\[\s*dot\s*\]\s*', '.'),
-        (r'\s*\(\s*dot\s*\)\s*', '.'),
-        (r'\s*\{\s*dot\s*\}\s*', '.'),
+        # Dot variants: [dot], (dot), {dot}, <dot>
+        (r'\s*[\[\(\{<]\s*dot\s*[\]\)\}>]\s*', '.'),
         (r'\s+dot\s+', '.'),
-        (r'\s*<\s*dot\s*>\s*', '.'),
         
-        # Underscore variants
-        (r'\s*\[\s*underscore\s*\]\s*', '_'),
-        (r'\s*\(\s*underscore\s*\)\s*', '_'),
+        # Underscore variants: [underscore], (underscore)
+        (r'\s*[\[\(]\s*underscore\s*[\]\)]\s*', '_'),
         
-        # Dash variants
-        (r'\s*\[\s*dash\s*\]\s*', '-'),
-        (r'\s*\(\s*dash\s*\)\s*', '-'),
+        # Dash variants: [dash], (dash)
+        (r'\s*[\[\(]\s*dash\s*[\]\)]\s*', '-'),
     ]
     
+    # Named group for each replacement in the combined de-obfuscation pattern
+    OBFUSCATION_GROUPS = {'@': 'AT', '.': 'DOT', '_': 'US', '-': 'DASH'}
+    
+    # Cheap probe for text that could change under de-obfuscation. Every
+    # obfuscation pattern needs an opening bracket, whitespace around a bare
+    # "at"/"dot", or whitespace next to "@" (a bare "@" maps to itself).
+    OBFUSCATION_PROBE = _re_engine.compile(r'[\[\(\{<]|\s@|@\s|\s(?:at|dot)\s', re.IGNORECASE)
+    OBFUSCATION_PROBE_B = _re_engine.compile(_bytes_source(OBFUSCATION_PROBE.pattern), re.IGNORECASE)
+    
     # Name extraction patterns (common patterns before emails)
     NAME_PATTERNS = [
         r'(?P<name>[A-Z][a-z]+\s+[A-Z][a-z]+)\s*[-–:]\s*$',  # "John Doe -" or "John Doe:"
@@ -80,18 +210,34 @@ class EmailExtractor:
         r'(?P<name>Dr\.|Mr\.|Ms\.|Mrs\.\s+[A-Z][a-z]+\s+[A-Z][a-z]+)',
     ]
     
+    # Company extraction patterns (common company indicators)
+    COMPANY_PATTERNS = [
+        r'(?:Company|Organization|Org|Corp|Inc|Ltd)[\s:]+([A-Z][A-Za-z\s]+)',
+        r'([A-Z][A-Za-z]+(?:\s+[A-Z][A-Za-z]+)*)\s+(?:Pvt\.?\s+Ltd\.?|Inc\.?|Corp\.?|LLC)',
+    ]
+    
+    # Compiled once per process and shared by every instance
+    COMPILED_OBFUSCATION, OBFUSCATION_BY_GROUP = _compile_obfuscation(
+        OBFUSCATION_REPLACEMENTS, OBFUSCATION_GROUPS
+    )
+    COMPILED_OBFUSCATION_B, OBFUSCATION_BY_GROUP_B = _compile_obfuscation(
+        OBFUSCATION_REPLACEMENTS, OBFUSCATION_GROUPS, as_bytes=True
+    )
+    COMPILED_NAME_PATTERNS = tuple(
+        re.compile(pattern, re.IGNORECASE) for pattern in NAME_PATTERNS
+    )
+    COMPILED_COMPANY_PATTERNS = tuple(
+        re.compile(pattern, re.IGNORECASE) for pattern in COMPANY_PATTERNS
+    )
+    
     def __init__(self):
-        """Initialize the email extractor."""
-        self.compiled_obfuscation = [
-            (re.compile(pattern, re.IGNORECASE), replacement)
-            for pattern, replacement in self.OBFUSCATION_REPLACEMENTS
-        ]
-        self.compiled_name_patterns = [
-            re.compile(pattern, re.IGNORECASE)
-            for pattern in self.NAME_PATTERNS
-        ]
-    
-    def extract_emails(self, text: str) -> list[dict]:
+        """Initialize the email extractor (patterns are precompiled)."""
+        self.combined_obfuscation = self.COMPILED_OBFUSCATION
+        self.obfuscation_by_group = self.OBFUSCATION_BY_GROUP
+        self.compiled_name_patterns = self.COMPILED_NAME_PATTERNS
+        self.compiled_company_patterns = self.COMPILED_COMPANY_PATTERNS
+    
+    def extract_emails(self, text: str) -> list[EmailMatch]:
         """
         Extract email addresses from text.
         
@@ -99,11 +245,15 @@ class EmailExtractor:
             text: The text content to extract emails from
             
         Returns:
-            List of dictionaries containing email and metadata
+            List of EmailMatch tuples containing email and metadata
         """
         if not text:
             return []
         
+        # Most PDF text is pure ASCII; it takes the bytes pipeline
+        if text.isascii():
+            return self.extract_emails_bytes(text.encode('ascii'))
+        
         # First, de-obfuscate the text
         normalized_text = self._de_obfuscate(text)
         
@@ -111,9 +261,13 @@ class EmailExtractor:
         emails_found = []
         seen_emails = set()
         
-        # Find all matches with context
-        for match in self.EMAIL_WITH_CONTEXT_PATTERN.finditer(normalized_text):
+        # Find all matches; context is sliced around each match, up to its
+        # neighbours
+        matches = list(self.EMAIL_PATTERN.finditer(normalized_text))
+        for match, before_start, after_end in _with_context(
+                matches, len(normalized_text), self.CONTEXT_CHARS):
             raw_email = match.group('email')
+            email_start, email_end = match.span('email')
             
             # Normalize the email
             email = self._normalize_email(raw_email)
@@ -129,9 +283,8 @@ class EmailExtractor:
             seen_emails.add(email)
             
             # Extract context
-            context_before = match.group('context_before').strip()
-            context_after = match.group('context_after').strip()
-            full_context = f"{context_before} [EMAIL] {context_after}".strip()
+            context_before = normalized_text[before_start:email_start].strip()
+            context_after = normalized_text[email_end:after_end].strip()
             
             # Try to extract name hint
             name_hint = self._extract_name_hint(context_before, context_after)
@@ -139,17 +292,116 @@ class EmailExtractor:
             # Try to extract company hint
             company_hint = self._extract_company_hint(context_before, context_after, email)
             
-            emails_found.append({
-                'email': email,
-                'raw_email': raw_email,
-                'context': full_context[:200] if full_context else None,
-                'name_hint': name_hint,
-                'company_hint': company_hint
-            })
+            # Only build the context string when there is surrounding text
+            if context_before or context_after:
+                context = f"{context_before} [EMAIL] {context_after}".strip()[:200]
+            else:
+                context = None
+            
+            emails_found.append(EmailMatch(
+                email,
+                raw_email,
+                context,
+                name_hint,
+                company_hint
+            ))
         
         logger.info(f"Extracted {len(emails_found)} unique emails from text")
         return emails_found
     
+    def extract_emails_bytes(self, data: bytes, keep_duplicates: bool = False,
+                             encoding: str = 'utf-8') -> list[EmailMatch]:
+        """
+        Extract email addresses from text that is already bytes.
+        
+        De-obfuscation and matching run on the bytes as-is; only each matched
+        address and its context window are decoded to str for validation and
+        hint extraction. Email spans are pure ASCII by construction.
+        
+        Args:
+            data: The encoded text content to extract emails from
+            keep_duplicates: Keep repeated emails (as extract_emails_with_duplicates)
+            encoding: Encoding of data, used to decode context windows
+            
+        Returns:
+            List of EmailMatch tuples containing email and metadata
+        """
+        if not data:
+            return []
+        
+        # First, de-obfuscate the bytes
+        normalized = self._de_obfuscate_bytes(data)
+        
+        emails_found = []
+        seen_emails = set()
+        
+        matches = list(self.EMAIL_PATTERN_B.finditer(normalized))
+        for match, before_start, after_end in _with_context(
+                matches, len(normalized), self.CONTEXT_CHARS):
+            raw_email = match.group('email').decode('ascii', 'ignore')
+            email_start, email_end = match.span('email')
+            
+            # Normalize the email
+            email = self._normalize_email(raw_email)
+            
+            # Skip duplicates unless asked to keep them
+            if not keep_duplicates and email in seen_emails:
+                continue
+            
+            # Skip invalid-looking emails
+            if not self._basic_validate(email):
+                continue
+            
+            seen_emails.add(email)
+            
+            # Extract context; a window edge may split a multi-byte character
+            context_before = normalized[before_start:email_start].decode(encoding, 'ignore').strip()
+            context_after = normalized[email_end:after_end].decode(encoding, 'ignore').strip()
+            
+            # Try to extract name and company hints
+            name_hint = self._extract_name_hint(context_before, context_after)
+            company_hint = self._extract_company_hint(context_before, context_after, email)
+            
+            # Only build the context string when there is surrounding text
+            if context_before or context_after:
+                context = f"{context_before} [EMAIL] {context_after}".strip()[:200]
+            else:
+                context = None
+            
+            emails_found.append(EmailMatch(
+                email,
+                raw_email,
+                context,
+                name_hint,
+                company_hint
+            ))
+        
+        logger.info(f"Extracted {len(emails_found)} emails from bytes")
+        return emails_found
+    
+    def extract_emails_batch(self, texts: list[str],
+                             executor: Optional[Executor] = None) -> list[list[EmailMatch]]:
+        """
+        Extract email addresses from several independent texts (e.g. pages).
+        
+        Texts are spread over a caller-owned process pool because the `re`
+        matcher holds the GIL, so threads would not run the scans in
+        parallel. Pass a long-lived pool (the app's app.state.pool); starting
+        one per call costs more than the scans it would parallelise.
+        
+        Args:
+            texts: The text blobs to extract emails from
+            executor: Process pool to run on (None = run inline)
+            
+        Returns:
+            One list of EmailMatch tuples per input text, in input order
+        """
+        if executor is None or len(texts) < 2:
+            return [self.extract_emails(text) for text in texts]
+        
+        chunksize = max(1, len(texts) // ((os.cpu_count() or 1) * 4))
+        return list(executor.map(_extract_emails_worker, texts, chunksize=chunksize))
+    
     def _de_obfuscate(self, text: str) -> str:
         """
         De-obfuscate text by replacing common obfuscation patterns.
@@ -158,66 +410,65 @@ class EmailExtractor:
             - "john [at] gmail [dot] com" -> "john@gmail.com"
             - "john(at)gmail.com" -> "john@gmail.com"
         """
-        result = text
+        probe = self.OBFUSCATION_PROBE.search(text)
+        if not probe:
+            return text
+        
+        # Text before the first probe hit can't change (a bare "@" maps to
+        # itself), so substitution starts there, backed up over whitespace a
+        # pattern may begin with
+        start = probe.start()
+        while start and text[start - 1].isspace():
+            start -= 1
+        
+        return text[:start] + self.combined_obfuscation.sub(self._replace_obfuscation, text[start:])
+    
+    def _de_obfuscate_bytes(self, data: bytes) -> bytes:
+        """Bytes counterpart of _de_obfuscate."""
+        probe = self.OBFUSCATION_PROBE_B.search(data)
+        if not probe:
+            return data
         
-        for pattern, replacement in self.compiled_obfuscation:
-            result = pattern.sub(replacement, result)
+        start = probe.start()
+        while start and data[start - 1] in BYTES_WHITESPACE:
+            start -= 1
         
-        return result
+        return data[:start] + self.COMPILED_OBFUSCATION_B.sub(self._replace_obfuscation_bytes, data[start:])
+    
+    def _replace_obfuscation(self, match: re.Match) -> str:
+        """Return the replacement for a combined obfuscation match."""
+        return self.obfuscation_by_group[match.lastgroup]
+    
+    def _replace_obfuscation_bytes(self, match: re.Match) -> bytes:
+        """Return the replacement for a combined bytes obfuscation match."""
+        return self.OBFUSCATION_BY_GROUP_B[match.lastgroup]
     
     def _normalize_email(self, email: str) -> str:
         """
         Normalize an email address.
         
         - Convert to lowercase
-        - Remove leading/trailing whitespace
-        - Remove surrounding punctuation
-        """
-        email = email.lower().strip()
-        
-        # Remove common surrounding punctuation
-        email = email.strip('.,;:!?\'"<>()[]{}')
+        - Remove leading dots
         
-        # Remove any remaining whitespace
-        email = ''.join(email.split())
-        
-        return email
+        EMAIL_PATTERN cannot match whitespace, quotes or brackets, and its
+        match always ends in a TLD letter, so a leading dot is the only
+        surrounding punctuation that can reach this point.
+        """
+        return email.lower().lstrip('.')
     
     def _basic_validate(self, email: str) -> bool:
         """
         Basic validation to filter out obvious non-emails.
         """
-        if not email or len(email) < 5:
-            return False
-        
-        if '@' not in email:
-            return False
-        
-        parts = email.split('@')
-        if len(parts) != 2:
-            return False
-        
-        local, domain = parts
-        
-        # Local part checks
-        if not local or len(local) > 64:
-            return False
-        
-        # Domain checks
-        if not domain or '.' not in domain:
-            return False
-        
-        # TLD check
-        tld = domain.split('.')[-1]
-        if len(tld) < 2 or not tld.isalpha():
-            return False
-        
-        return True
+        return self.VALIDATE_PATTERN.fullmatch(email) is not None
     
     def _extract_name_hint(self, before: str, after: str) -> Optional[str]:
         """
         Try to extract a name from the context around the email.
         """
+        if not before or HINT_LETTERS.isdisjoint(before):
+            return None
+        
         # Check context before the email first
         for pattern in self.compiled_name_patterns:
             match = pattern.search(before)
@@ -240,32 +491,17 @@ class EmailExtractor:
         Try to extract a company name from context or email domain.
         """
         context = f"{before} {after}"
-        
-        # Common company indicators
-        company_patterns = [
-            r'(?:Company|Organization|Org|Corp|Inc|Ltd)[\s:]+([A-Z][A-Za-z\s]+)',
-            r'([A-Z][A-Za-z]+(?:\s+[A-Z][A-Za-z]+)*)\s+(?:Pvt\.?\s+Ltd\.?|Inc\.?|Corp\.?|LLC)',
-        ]
-        
-        for pattern in company_patterns:
-            match = re.search(pattern, context, re.IGNORECASE)
-            if match:
-                company = match.group(1).strip()
-                if company and len(company) > 2:
-                    return company
+        if not HINT_LETTERS.isdisjoint(context):
+            for pattern in self.compiled_company_patterns:
+                match = pattern.search(context)
+                if match:
+                    company = match.group(1).strip()
+                    if company and len(company) > 2:
+                        return company
         
         # Infer from email domain if it's not a common email provider
-        domain = email.split('@')[1] if '@' in email else None
-        if domain:
-            common_providers = {
-                'gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com',
-                'icloud.com', 'aol.com', 'mail.com', 'protonmail.com'
-            }
-            if domain not in common_providers:
-                # Extract company name from domain
-                company_part = domain.split('.')[0]
-                if len(company_part) > 2:
-                    return company_part.replace('-', ' ').replace('_', ' ').title()
+        if '@' in email:
+            return _domain_to_company(email.split('@')[1])
         
         return None
     
@@ -287,7 +523,7 @@ class EmailExtractor:
         
         return sorted(list(emails))
     
-    def extract_emails_with_duplicates(self, text: str) -> list[dict]:
+    def extract_emails_with_duplicates(self, text: str) -> list[EmailMatch]:
         """
         Extract email addresses from text WITHOUT removing duplicates.
         This allows tracking of duplicate emails across the document.
@@ -296,59 +532,83 @@ class EmailExtractor:
             text: The text content to extract emails from
             
         Returns:
-            List of dictionaries containing email and metadata (may contain duplicates)
+            List of EmailMatch tuples containing email and metadata (may contain duplicates)
         """
         if not text:
             return []
         
+        # Most PDF text is pure ASCII; it takes the bytes pipeline
+        if text.isascii():
+            return self.extract_emails_bytes(text.encode('ascii'), keep_duplicates=True)
+        
         # First, de-obfuscate the text
         normalized_text = self._de_obfuscate(text)
         
         # Extract all emails (including duplicates)
         emails_found = []
-        seen_positions = set()  # Track email positions to avoid overlapping matches
         
-        # Find all matches with context
-        for match in self.EMAIL_WITH_CONTEXT_PATTERN.finditer(normalized_text):
+        # Bind hot-loop lookups to locals; this runs once per match
+        normalize_email = self._normalize_email
+        basic_validate = self._basic_validate
+        extract_name_hint = self._extract_name_hint
+        extract_company_hint = self._extract_company_hint
+        append = emails_found.append
+        
+        # Find all matches; finditer never yields overlapping matches, and
+        # context windows stop at the neighbouring matches
+        matches = list(self.EMAIL_PATTERN.finditer(normalized_text))
+        for match, before_start, after_end in _with_context(
+                matches, len(normalized_text), self.CONTEXT_CHARS):
             raw_email = match.group('email')
-            email_start = match.start('email')
-            email_end = match.end('email')
-            
-            # Skip if we've already processed this exact position
-            if email_start in seen_positions:
-                continue
-            seen_positions.add(email_start)
+            email_start, email_end = match.span('email')
             
             # Normalize the email
-            email = self._normalize_email(raw_email)
+            email = normalize_email(raw_email)
             
             # Skip invalid-looking emails
-            if not self._basic_validate(email):
+            if not basic_validate(email):
                 continue
             
             # Extract context
-            context_before = match.group('context_before').strip()
-            context_after = match.group('context_after').strip()
-            full_context = f"{context_before} [EMAIL] {context_after}".strip()
+            context_before = normalized_text[before_start:email_start].strip()
+            context_after = normalized_text[email_end:after_end].strip()
             
             # Try to extract name hint
-            name_hint = self._extract_name_hint(context_before, context_after)
+            name_hint = extract_name_hint(context_before, context_after)
             
             # Try to extract company hint
-            company_hint = self._extract_company_hint(context_before, context_after, email)
+            company_hint = extract_company_hint(context_before, context_after, email)
             
-            emails_found.append({
-                'email': email,
-                'raw_email': raw_email,
-                'context': full_context[:200] if full_context else None,
-                'name_hint': name_hint,
-                'company_hint': company_hint
-            })
+            # Only build the context string when there is surrounding text
+            if context_before or context_after:
+                context = f"{context_before} [EMAIL] {context_after}".strip()[:200]
+            else:
+                context = None
+            
+            append(EmailMatch(
+                email,
+                raw_email,
+                context,
+                name_hint,
+                company_hint
+            ))
         
         logger.info(f"Extracted {len(emails_found)} emails (with duplicates) from text")
         return emails_found
 
 
+# Per-process extractor used by extract_emails_batch workers
+_worker_extractor: Optional[EmailExtractor] = None
+
+
+def _extract_emails_worker(text: str) -> list[EmailMatch]:
+    """Process-pool entry point for EmailExtractor.extract_emails_batch."""
+    global _worker_extractor
+    if _worker_extractor is None:
+        _worker_extractor = EmailExtractor()
+    return _worker_extractor.extract_emails(text)
+
+
 # Command-line testing
 if __name__ == "__main__":
     test_texts = [
@@ -366,6 +626,6 @@ if __name__ == "__main__":
         print(f"\nInput: {text}")
         results = extractor.extract_emails(text)
         for r in results:
-            print(f"  Found: {r['email']}")
-            if r.get('name_hint'):
-                print(f"    Name: {r['name_hint']}")
+            print(f"  Found: {r.email}")
+            if r.name_hint:
+                print(f"    Name: {r.name_hint}")
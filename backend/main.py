@@ -2,50 +2,110 @@
 FastAPI main application for PDF Email Extractor.
 Handles file uploads, processing, and export endpoints.
 """
+import io
 import os
+import csv
+import time
 import uuid
+import hashlib
+import queue
 import asyncio
+import multiprocessing
+from collections import Counter, OrderedDict
+from operator import attrgetter, itemgetter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 from contextlib import asynccontextmanager
+from tempfile import SpooledTemporaryFile
 
+import aiofiles
 from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
 from .config import (
     UPLOAD_DIR, EXPORT_DIR, MAX_FILE_SIZE_BYTES, 
-    ALLOWED_EXTENSIONS, AUTO_DELETE_AFTER_SECONDS
+    ALLOWED_EXTENSIONS, UPLOAD_CHUNK_SIZE, AUTO_DELETE_AFTER_SECONDS, MAX_STORED_JOBS,
+    get_upload_dir
 )
-from .pdf_processor import PDFProcessor
+from .pdf_processor import PDFProcessor, _extract_text_worker
 from .email_extractor import EmailExtractor
-from .validator import EmailValidator
+from .validator import EmailValidator, load_mx_cache, save_mx_cache
 from .utils.helpers import cleanup_old_files
 
 
-# In-memory storage for results (use Redis/DB in production)
-results_store: dict = {}
+# In-memory storage for results (use Redis/DB in production), bounded to the
+# MAX_STORED_JOBS most recently used jobs
+results_store: OrderedDict = OrderedDict()
+
+# Content fingerprint of an uploaded PDF -> id of the job that processed it,
+# and the reverse, so a job leaving results_store also drops its fingerprint
+fingerprint_cache: dict[bytes, str] = {}
+job_fingerprints: dict[str, bytes] = {}
+
+# Shared by all jobs; the classes hold no per-job state and compile their
+# patterns once
+_PROCESSOR = PDFProcessor()
+_EXTRACTOR = EmailExtractor()
+_VALIDATOR = EmailValidator()
+
+
+async def drain_progress(progress_queue) -> None:
+    """Apply page progress reported by PDF workers to the results store."""
+    while True:
+        try:
+            (job_id, label), current_page, total_pages = progress_queue.get_nowait()
+        except queue.Empty:
+            await asyncio.sleep(0.2)
+            continue
+        
+        # Publish each snapshot in one update so readers never see a mix
+        job = results_store.get(job_id)
+        if job is not None:
+            job.update({
+                "current_page": current_page,
+                "total_pages": total_pages,
+                "progress_text": f"{label}Processing page {current_page} of {total_pages}..."
+            })
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Lifecycle manager for cleanup tasks."""
+    """Lifecycle manager for the worker pool and cleanup tasks."""
     # Startup: Clean old files
     cleanup_old_files(UPLOAD_DIR, AUTO_DELETE_AFTER_SECONDS)
     cleanup_old_files(EXPORT_DIR, AUTO_DELETE_AFTER_SECONDS)
+    if _VALIDATOR.enable_dns:
+        load_mx_cache()
+    
+    # Shared process pool for CPU-bound PDF parsing; workers report page
+    # progress through a managed queue that is drained on the event loop
+    app.state.pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    app.state.manager = multiprocessing.Manager()
+    app.state.progress_queue = app.state.manager.Queue()
+    progress_task = asyncio.create_task(drain_progress(app.state.progress_queue))
+    
     yield
-    # Shutdown: Final cleanup
+    
+    # Shutdown: Stop workers, then final cleanup
+    progress_task.cancel()
+    app.state.pool.shutdown(cancel_futures=True)
+    app.state.manager.shutdown()
     cleanup_old_files(UPLOAD_DIR, 0)
+    if _VALIDATOR.enable_dns:
+        save_mx_cache()
 
 
 app = FastAPI(
     title="PDF Email Extractor",
     description="Extract and validate email addresses from PDF files",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware for frontend access
@@ -68,7 +128,13 @@ async def health_check():
 
 # ==================== Models ====================
 
+# Response models are built once and never modified
+_RESPONSE_MODEL_CONFIG = ConfigDict(frozen=True, extra="ignore")
+
+
 class EmailResult(BaseModel):
+    model_config = _RESPONSE_MODEL_CONFIG
+    
     email: str
     confidence: float
     is_valid: bool
@@ -79,6 +145,8 @@ class EmailResult(BaseModel):
 
 
 class ProcessingResult(BaseModel):
+    model_config = _RESPONSE_MODEL_CONFIG
+    
     id: str
     status: str
     filename: str
@@ -91,11 +159,17 @@ class ProcessingResult(BaseModel):
 
 
 class UploadResponse(BaseModel):
+    model_config = _RESPONSE_MODEL_CONFIG
+    
     id: str
     message: str
     status: str
 
 
+# Serializes a whole list of results in one pydantic-core call
+_EMAIL_LIST_ADAPTER = TypeAdapter(list[EmailResult])
+
+
 # ==================== Helper Functions ====================
 
 def validate_file(file: UploadFile) -> None:
@@ -109,103 +183,143 @@ def validate_file(file: UploadFile) -> None:
         )
 
 
-async def save_upload_file(file: UploadFile, destination: Path) -> int:
-    """Save uploaded file and return file size."""
+def store_job(job_id: str, job: dict) -> None:
+    """Add a job to results_store, dropping the least recently used beyond MAX_STORED_JOBS."""
+    results_store[job_id] = job
+    results_store.move_to_end(job_id)
+    while len(results_store) > MAX_STORED_JOBS:
+        evicted_id, _ = results_store.popitem(last=False)
+        forget_fingerprint(evicted_id)
+
+
+def remember_fingerprint(fingerprint: bytes, job_id: str) -> None:
+    """Let later uploads with this content reuse the results of job_id."""
+    fingerprint_cache[fingerprint] = job_id
+    job_fingerprints[job_id] = fingerprint
+
+
+def forget_fingerprint(job_id: str) -> None:
+    """Drop the fingerprint pointing at a job that is no longer stored."""
+    fingerprint = job_fingerprints.pop(job_id, None)
+    if fingerprint is not None and fingerprint_cache.get(fingerprint) == job_id:
+        del fingerprint_cache[fingerprint]
+
+
+async def validate_emails(emails: list[str]) -> list[dict]:
+    """
+    Validate emails without blocking the event loop.
+    
+    validate_batch resolves, on a bounded thread pool (MX_LOOKUP_WORKERS),
+    the MX records of the distinct domains that will get the MX check. The validator caches
+    each address's DNS-free result but re-applies the TTL'd MX check on
+    every call.
+    """
+    return await asyncio.to_thread(_VALIDATOR.validate_batch, emails)
+
+
+async def save_upload_file(file: UploadFile, destination: Path) -> tuple[int, bytes]:
+    """Save uploaded file and return its size and content fingerprint."""
     total_size = 0
-    with open(destination, "wb") as buffer:
-        while chunk := await file.read(8192):
+    too_large = False
+    hasher = hashlib.blake2b(digest_size=16)
+    
+    # Reject non-PDF content before anything is written to disk
+    chunk = await file.read(UPLOAD_CHUNK_SIZE)
+    if not chunk.startswith(b"%PDF-"):
+        raise HTTPException(
+            status_code=415,
+            detail="Invalid file content. The file is not a PDF."
+        )
+    
+    # Async file I/O so concurrent uploads don't block the event loop
+    async with aiofiles.open(destination, "wb") as buffer:
+        while chunk:
             total_size += len(chunk)
             if total_size > MAX_FILE_SIZE_BYTES:
-                # Clean up partial file
-                buffer.close()
-                destination.unlink(missing_ok=True)
-                raise HTTPException(
-                    status_code=413,
-                    detail=f"File too large. Maximum size is {MAX_FILE_SIZE_BYTES // (1024*1024)} MB."
-                )
-            buffer.write(chunk)
-    return total_size
+                too_large = True
+                break
+            hasher.update(chunk)
+            await buffer.write(chunk)
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+    
+    if too_large:
+        # Clean up partial file
+        destination.unlink(missing_ok=True)
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large. Maximum size is {MAX_FILE_SIZE_BYTES // (1024*1024)} MB."
+        )
+    return total_size, hasher.digest()
 
 
-async def process_pdf_task(job_id: str, file_path: Path, filename: str) -> None:
+async def process_pdf_task(job_id: str, file_path: Path, filename: str,
+                           fingerprint: Optional[bytes] = None) -> None:
     """Background task to process PDF and extract emails."""
-    start_time = datetime.now()
+    # Held directly so the task keeps working if the entry is evicted
+    job = results_store[job_id]
+    start_time = time.perf_counter()
     
     try:
-        results_store[job_id]["status"] = "processing"
-        
-        # Extract text from PDF with progress tracking
-        processor = PDFProcessor()
+        job["status"] = "processing"
         
         # Get total page count first
-        total_pages = processor.get_page_count(str(file_path))
-        results_store[job_id]["total_pages"] = total_pages
-        results_store[job_id]["current_page"] = 0
-        results_store[job_id]["progress_text"] = f"Processing page 0 of {total_pages}..."
-        
-        # Run extraction in thread pool to not block event loop
-        import concurrent.futures
-        
-        def extract_with_progress():
-            def update_progress(current_page: int, total_pages: int):
-                results_store[job_id]["current_page"] = current_page
-                results_store[job_id]["total_pages"] = total_pages
-                results_store[job_id]["progress_text"] = f"Processing page {current_page} of {total_pages}..."
-            return processor.extract_text(str(file_path), progress_callback=update_progress)
+        total_pages = _PROCESSOR.get_page_count(str(file_path))
+        job["total_pages"] = total_pages
+        job["current_page"] = 0
+        job["progress_text"] = f"Processing page 0 of {total_pages}..."
         
-        loop = asyncio.get_event_loop()
-        with concurrent.futures.ThreadPoolExecutor() as pool:
-            text_content = await loop.run_in_executor(pool, extract_with_progress)
+        # Run extraction in the shared process pool to not block event loop
+        loop = asyncio.get_running_loop()
+        text_content = await loop.run_in_executor(
+            app.state.pool, _extract_text_worker,
+            str(file_path), app.state.progress_queue, (job_id, "")
+        )
         
         # Extract emails from text (includes duplicates)
-        extractor = EmailExtractor()
-        raw_emails = extractor.extract_emails_with_duplicates(text_content)
+        raw_emails = _EXTRACTOR.extract_emails_with_duplicates(text_content)
         
         # Debug: print raw email counts
         print(f"DEBUG: Raw emails extracted: {len(raw_emails)}")
         
-        # Track duplicates
-        email_counts = {}
+        # Track duplicates: occurrence counts plus each email's first occurrence
+        counts = Counter()
+        first_seen = {}
         for email_data in raw_emails:
-            email = email_data["email"]
-            if email in email_counts:
-                email_counts[email]["count"] += 1
-            else:
-                email_counts[email] = {"count": 1, "data": email_data}
+            email = email_data.email
+            if email not in first_seen:
+                first_seen[email] = email_data
+            counts[email] += 1
         
         # Debug: print counts
-        print(f"DEBUG: Unique email addresses: {len(email_counts)}")
-        duplicate_count = sum(1 for info in email_counts.values() if info["count"] > 1)
+        print(f"DEBUG: Unique email addresses: {len(first_seen)}")
+        duplicate_count = sum(1 for count in counts.values() if count > 1)
         print(f"DEBUG: Emails with count > 1: {duplicate_count}")
         
         # Separate duplicates (count > 1) from unique emails
-        duplicates = []
-        unique_emails = []
-        
-        for email, info in email_counts.items():
-            if info["count"] > 1:
-                duplicates.append({
-                    "email": email,
-                    "count": info["count"],
-                    "domain": email.split("@")[1] if "@" in email else ""
-                })
-            unique_emails.append(info["data"])
+        duplicates = [
+            {
+                "email": email,
+                "count": count,
+                "domain": email.split("@")[1] if "@" in email else ""
+            }
+            for email, count in counts.items() if count > 1
+        ]
+        unique_emails = list(first_seen.values())
         
         # Validate and score emails
-        validator = EmailValidator()
         validated_emails = []
         valid_count = 0
         invalid_count = 0
         
-        for email_data in unique_emails:
-            validation_result = validator.validate(email_data["email"])
-            
-            email_result = EmailResult(
-                email=email_data["email"],
+        validation_results = await validate_emails([email_data.email for email_data in unique_emails])
+        for email_data, validation_result in zip(unique_emails, validation_results):
+            # Fields come straight from the validator, so skip re-validation
+            email_result = EmailResult.model_construct(
+                email=email_data.email,
                 confidence=validation_result["confidence"],
                 is_valid=validation_result["is_valid"],
-                context=email_data.get("context"),
-                name_hint=email_data.get("name_hint"),
+                context=email_data.context,
+                name_hint=email_data.name_hint,
                 domain=validation_result["domain"],
                 validation_details=validation_result["details"]
             )
@@ -217,25 +331,30 @@ async def process_pdf_task(job_id: str, file_path: Path, filename: str) -> None:
                 invalid_count += 1
         
         # Sort by confidence (highest first)
-        validated_emails.sort(key=lambda x: x.confidence, reverse=True)
+        validated_emails.sort(key=attrgetter("confidence"), reverse=True)
         # Sort duplicates by count (highest first)
-        duplicates.sort(key=lambda x: x["count"], reverse=True)
+        duplicates.sort(key=itemgetter("count"), reverse=True)
         
-        processing_time = (datetime.now() - start_time).total_seconds()
+        processing_time = time.perf_counter() - start_time
         
         # Update results
-        results_store[job_id].update({
+        job.update({
             "status": "completed",
             "total_emails": len(validated_emails),
             "valid_emails": valid_count,
             "invalid_emails": invalid_count,
-            "emails": [e.model_dump() for e in validated_emails],
+            "emails": _EMAIL_LIST_ADAPTER.dump_python(validated_emails),
             "duplicates": duplicates,
             "processing_time": processing_time
         })
         
+        # Identical uploads can reuse these results (unless the job was
+        # already evicted while it ran)
+        if fingerprint is not None and job_id in results_store:
+            remember_fingerprint(fingerprint, job_id)
+        
     except Exception as e:
-        results_store[job_id].update({
+        job.update({
             "status": "failed",
             "error": str(e)
         })
@@ -262,11 +381,27 @@ async def upload_pdf(
     job_id = str(uuid.uuid4())
     
     # Save file
-    file_path = UPLOAD_DIR / f"{job_id}_{file.filename}"
-    await save_upload_file(file, file_path)
+    file_path = get_upload_dir() / f"{job_id}_{file.filename}"
+    _, fingerprint = await save_upload_file(file, file_path)
+    
+    # Same content as an earlier completed job: copy its results
+    previous = results_store.get(fingerprint_cache.get(fingerprint))
+    if previous is not None and previous["status"] == "completed":
+        file_path.unlink(missing_ok=True)
+        store_job(job_id, {
+            **previous,
+            "id": job_id,
+            "filename": file.filename,
+            "created_at": datetime.now().isoformat()
+        })
+        return UploadResponse(
+            id=job_id,
+            message="File already processed. Previous results reused.",
+            status="completed"
+        )
     
     # Initialize result entry
-    results_store[job_id] = {
+    store_job(job_id, {
         "id": job_id,
         "status": "queued",
         "filename": file.filename,
@@ -276,10 +411,10 @@ async def upload_pdf(
         "emails": [],
         "processing_time": 0,
         "created_at": datetime.now().isoformat()
-    }
+    })
     
     # Start background processing
-    background_tasks.add_task(process_pdf_task, job_id, file_path, file.filename)
+    background_tasks.add_task(process_pdf_task, job_id, file_path, file.filename, fingerprint)
     
     return UploadResponse(
         id=job_id,
@@ -290,116 +425,112 @@ async def upload_pdf(
 
 async def process_multiple_pdfs_task(job_id: str, file_paths: list[tuple[Path, str]]) -> None:
     """Background task to process multiple PDFs and combine results."""
-    start_time = datetime.now()
+    # Held directly so the task keeps working if the entry is evicted
+    job = results_store[job_id]
+    start_time = time.perf_counter()
     
     try:
-        results_store[job_id]["status"] = "processing"
-        
-        processor = PDFProcessor()
-        extractor = EmailExtractor()
-        validator = EmailValidator()
+        job["status"] = "processing"
         
-        # Track all emails with counts for duplicates
-        email_counts = {}
-        filenames_processed = []
+        filenames_processed = [filename for _, filename in file_paths]
         total_files = len(file_paths)
+        job["file_progress"] = f"Processed 0 of {total_files} files"
+        job["progress_text"] = f"Processing {total_files} files..."
         
-        import concurrent.futures
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         
-        for file_index, (file_path, filename) in enumerate(file_paths, 1):
+        async def extract_file(file_index: int, file_path: Path, filename: str):
+            """Extract one file in the process pool and find its emails."""
             try:
-                results_store[job_id]["current_file"] = filename
-                results_store[job_id]["file_progress"] = f"Processing file {file_index} of {total_files}: {filename}"
-                filenames_processed.append(filename)
-                
-                # Get total page count first
-                total_pages = processor.get_page_count(str(file_path))
-                results_store[job_id]["total_pages"] = total_pages
-                results_store[job_id]["current_page"] = 0
-                results_store[job_id]["progress_text"] = f"File {file_index}/{total_files} ({filename}): Processing page 0 of {total_pages}..."
-                
-                # Run extraction in thread pool to not block event loop
-                def extract_with_progress(fpath=str(file_path), fidx=file_index, fname=filename):
-                    def update_progress(current_page: int, total_pages: int):
-                        results_store[job_id]["current_page"] = current_page
-                        results_store[job_id]["total_pages"] = total_pages
-                        results_store[job_id]["progress_text"] = f"File {fidx}/{total_files} ({fname}): Processing page {current_page} of {total_pages}..."
-                    return processor.extract_text(fpath, progress_callback=update_progress)
-                
-                with concurrent.futures.ThreadPoolExecutor() as pool:
-                    text_content = await loop.run_in_executor(pool, extract_with_progress)
-                
+                text_content = await loop.run_in_executor(
+                    app.state.pool, _extract_text_worker,
+                    str(file_path), app.state.progress_queue, (job_id, f"{filename}: ")
+                )
                 # Extract emails from text (with duplicates)
-                raw_emails = extractor.extract_emails_with_duplicates(text_content)
-                
-                # Track all occurrences
-                for email_data in raw_emails:
-                    email = email_data["email"]
-                    if email in email_counts:
-                        email_counts[email]["count"] += 1
-                    else:
-                        email_counts[email] = {"count": 1, "data": email_data}
-                    
+                raw_emails = _EXTRACTOR.extract_emails_with_duplicates(text_content)
             except Exception as e:
                 print(f"Error processing {filename}: {e}")
+                raw_emails = []
             finally:
                 # Clean up uploaded file
                 file_path.unlink(missing_ok=True)
+            return file_index, filename, raw_emails
         
-        # Separate duplicates from unique emails
-        duplicates = []
-        unique_emails = []
+        # Parse all files concurrently; progress counts completed files
+        emails_per_file = [[] for _ in file_paths]
+        tasks = [
+            extract_file(file_index, file_path, filename)
+            for file_index, (file_path, filename) in enumerate(file_paths)
+        ]
+        for completed, next_done in enumerate(asyncio.as_completed(tasks), 1):
+            file_index, filename, raw_emails = await next_done
+            emails_per_file[file_index] = raw_emails
+            job["current_file"] = filename
+            job["file_progress"] = f"Processed {completed} of {total_files} files"
+            job["progress_text"] = f"Processed {completed} of {total_files} files..."
         
-        for email, info in email_counts.items():
-            if info["count"] > 1:
-                duplicates.append({
-                    "email": email,
-                    "count": info["count"],
-                    "domain": email.split("@")[1] if "@" in email else ""
-                })
-            unique_emails.append(info["data"])
+        # Track all occurrences, merged in upload order: occurrence counts
+        # plus each email's first occurrence
+        counts = Counter()
+        first_seen = {}
+        for raw_emails in emails_per_file:
+            for email_data in raw_emails:
+                email = email_data.email
+                if email not in first_seen:
+                    first_seen[email] = email_data
+                counts[email] += 1
+        
+        # Separate duplicates from unique emails
+        duplicates = [
+            {
+                "email": email,
+                "count": count,
+                "domain": email.split("@")[1] if "@" in email else ""
+            }
+            for email, count in counts.items() if count > 1
+        ]
+        unique_emails = list(first_seen.values())
         
         # Validate and score unique emails
         all_validated_emails = []
-        for email_data in unique_emails:
-            validation_result = validator.validate(email_data["email"])
-            
-            email_result = EmailResult(
-                email=email_data["email"],
+        validation_results = await validate_emails([email_data.email for email_data in unique_emails])
+        for email_data, validation_result in zip(unique_emails, validation_results):
+            # Fields come straight from the validator, so skip re-validation
+            email_result = EmailResult.model_construct(
+                email=email_data.email,
                 confidence=validation_result["confidence"],
                 is_valid=validation_result["is_valid"],
-                context=email_data.get("context"),
-                name_hint=email_data.get("name_hint"),
+                context=email_data.context,
+                name_hint=email_data.name_hint,
                 domain=validation_result["domain"],
                 validation_details=validation_result["details"]
             )
             all_validated_emails.append(email_result)
         
         # Sort by confidence (highest first)
-        all_validated_emails.sort(key=lambda x: x.confidence, reverse=True)
+        all_validated_emails.sort(key=attrgetter("confidence"), reverse=True)
         # Sort duplicates by count (highest first)
-        duplicates.sort(key=lambda x: x["count"], reverse=True)
+        duplicates.sort(key=itemgetter("count"), reverse=True)
         
         valid_count = sum(1 for e in all_validated_emails if e.is_valid)
         invalid_count = len(all_validated_emails) - valid_count
         
-        processing_time = (datetime.now() - start_time).total_seconds()
+        processing_time = time.perf_counter() - start_time
         
         # Update results
-        results_store[job_id].update({
+        job.update({
             "status": "completed",
             "total_emails": len(all_validated_emails),
             "valid_emails": valid_count,
             "invalid_emails": invalid_count,
-            "emails": [e.model_dump() for e in all_validated_emails],
+            "emails": _EMAIL_LIST_ADAPTER.dump_python(all_validated_emails),
             "duplicates": duplicates,
             "processing_time": processing_time,
             "files_processed": filenames_processed
         })
         
     except Exception as e:
-        results_store[job_id].update({
+        job.update({
             "status": "failed",
             "error": str(e)
         })
@@ -421,13 +552,13 @@ async def upload_multiple_pdfs(
     
     for file in files:
         validate_file(file)
-        file_path = UPLOAD_DIR / f"{job_id}_{file.filename}"
+        file_path = get_upload_dir() / f"{job_id}_{file.filename}"
         await save_upload_file(file, file_path)
         file_paths.append((file_path, file.filename))
         filenames.append(file.filename)
     
     # Initialize combined result entry
-    results_store[job_id] = {
+    store_job(job_id, {
         "id": job_id,
         "status": "queued",
         "filename": ", ".join(filenames),
@@ -438,7 +569,7 @@ async def upload_multiple_pdfs(
         "processing_time": 0,
         "created_at": datetime.now().isoformat(),
         "file_count": len(files)
-    }
+    })
     
     # Start background processing for all files combined
     background_tasks.add_task(process_multiple_pdfs_task, job_id, file_paths)
@@ -459,7 +590,123 @@ async def get_results(job_id: str):
     if job_id not in results_store:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    return results_store[job_id]
+    results_store.move_to_end(job_id)
+    # Already plain JSON data; returning a response skips jsonable_encoder
+    return ORJSONResponse(results_store[job_id])
+
+
+# ==================== Export Helpers ====================
+
+EXPORT_HEADERS = ["Email", "Confidence", "Valid", "Domain", "Context", "Name Hint"]
+EXPORT_CHUNK_SIZE = 64 * 1024  # bytes of export text buffered per streamed chunk
+
+
+def _export_rows(emails: list[dict]):
+    """Yield one export row per email, in EXPORT_HEADERS order."""
+    for email in emails:
+        yield [
+            email["email"],
+            f"{email['confidence']:.1f}%",
+            "Yes" if email["is_valid"] else "No",
+            email["domain"],
+            email.get("context", ""),
+            email.get("name_hint", "")
+        ]
+
+
+def _csv_chunks(emails: list[dict]):
+    """Yield the CSV export in chunks of roughly EXPORT_CHUNK_SIZE."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_HEADERS)
+    for row in _export_rows(emails):
+        writer.writerow(row)
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _txt_chunks(result: dict):
+    """Yield the plain-text export section by section."""
+    emails = result["emails"]
+    yield (
+        f"PDF Email Extraction Results\n"
+        f"Generated: {datetime.now().isoformat()}\n"
+        f"Source: {result['filename']}\n"
+        f"{'='*50}\n\n"
+        f"Total: {result['total_emails']} | Valid: {result['valid_emails']} | Invalid: {result['invalid_emails']}\n\n"
+    )
+    
+    yield "Valid Emails:\n" + "-" * 30 + "\n"
+    yield "".join(
+        f"{email['email']} (Confidence: {email['confidence']:.1f}%)\n"
+        for email in emails if email["is_valid"]
+    )
+    
+    yield "\nInvalid/Suspicious Emails:\n" + "-" * 30 + "\n"
+    yield "".join(
+        f"{email['email']} (Confidence: {email['confidence']:.1f}%)\n"
+        for email in emails if not email["is_valid"]
+    )
+
+
+def _build_xlsx(emails: list[dict]) -> SpooledTemporaryFile:
+    """
+    Write the XLSX export into a spooled temporary file (rewound).
+    
+    Uses a write-only workbook so rows are written out as they are appended
+    instead of being held as cell objects. Raises ImportError without openpyxl.
+    """
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill, Alignment
+    from openpyxl.utils import get_column_letter
+    
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Extracted Emails")
+    
+    # Build rows and their column widths in one pass; widths must be set
+    # before any row is written
+    rows = []
+    widths = [len(header) for header in EXPORT_HEADERS]
+    for row in _export_rows(emails):
+        rows.append(row)
+        widths = [max(width, len(str(value or ""))) for width, value in zip(widths, row)]
+    for col, width in enumerate(widths, 1):
+        ws.column_dimensions[get_column_letter(col)].width = min(width + 2, 50)
+    
+    # Header styling
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    
+    header_cells = []
+    for header in EXPORT_HEADERS:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.alignment = Alignment(horizontal="center")
+        header_cells.append(cell)
+    ws.append(header_cells)
+    
+    # Data rows
+    for row in rows:
+        ws.append(row)
+    
+    spool = SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+    wb.save(spool)
+    spool.seek(0)
+    return spool
+
+
+def _file_chunks(file_obj):
+    """Yield a file object's content in EXPORT_CHUNK_SIZE chunks, then close it."""
+    try:
+        while chunk := file_obj.read(EXPORT_CHUNK_SIZE):
+            yield chunk
+    finally:
+        file_obj.close()
 
 
 @app.get("/export/{job_id}")
@@ -482,90 +729,30 @@ async def export_results(
         )
     
     emails = result["emails"]
-    filename = f"emails_{job_id[:8]}"
-    export_path = EXPORT_DIR / f"{filename}.{format}"
+    filename = f"emails_{job_id[:8]}.{format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
     
     if format == "csv":
-        import csv
-        with open(export_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["Email", "Confidence", "Valid", "Domain", "Context", "Name Hint"])
-            for email in emails:
-                writer.writerow([
-                    email["email"],
-                    f"{email['confidence']:.1f}%",
-                    "Yes" if email["is_valid"] else "No",
-                    email["domain"],
-                    email.get("context", ""),
-                    email.get("name_hint", "")
-                ])
+        content = _csv_chunks(emails)
     
     elif format == "txt":
-        with open(export_path, "w", encoding="utf-8") as f:
-            f.write(f"PDF Email Extraction Results\n")
-            f.write(f"Generated: {datetime.now().isoformat()}\n")
-            f.write(f"Source: {result['filename']}\n")
-            f.write(f"{'='*50}\n\n")
-            f.write(f"Total: {result['total_emails']} | Valid: {result['valid_emails']} | Invalid: {result['invalid_emails']}\n\n")
-            
-            f.write("Valid Emails:\n")
-            f.write("-" * 30 + "\n")
-            for email in emails:
-                if email["is_valid"]:
-                    f.write(f"{email['email']} (Confidence: {email['confidence']:.1f}%)\n")
-            
-            f.write("\nInvalid/Suspicious Emails:\n")
-            f.write("-" * 30 + "\n")
-            for email in emails:
-                if not email["is_valid"]:
-                    f.write(f"{email['email']} (Confidence: {email['confidence']:.1f}%)\n")
+        content = _txt_chunks(result)
     
     elif format == "xlsx":
         try:
-            import openpyxl
-            from openpyxl.styles import Font, PatternFill, Alignment
-            
-            wb = openpyxl.Workbook()
-            ws = wb.active
-            ws.title = "Extracted Emails"
-            
-            # Header styling
-            header_font = Font(bold=True, color="FFFFFF")
-            header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-            
-            headers = ["Email", "Confidence", "Valid", "Domain", "Context", "Name Hint"]
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row=1, column=col, value=header)
-                cell.font = header_font
-                cell.fill = header_fill
-                cell.alignment = Alignment(horizontal="center")
-            
-            # Data rows
-            for row, email in enumerate(emails, 2):
-                ws.cell(row=row, column=1, value=email["email"])
-                ws.cell(row=row, column=2, value=f"{email['confidence']:.1f}%")
-                ws.cell(row=row, column=3, value="Yes" if email["is_valid"] else "No")
-                ws.cell(row=row, column=4, value=email["domain"])
-                ws.cell(row=row, column=5, value=email.get("context", ""))
-                ws.cell(row=row, column=6, value=email.get("name_hint", ""))
-            
-            # Auto-adjust column widths
-            for col in ws.columns:
-                max_length = max(len(str(cell.value or "")) for cell in col)
-                ws.column_dimensions[col[0].column_letter].width = min(max_length + 2, 50)
-            
-            wb.save(export_path)
-            
+            # Workbook generation is CPU-bound; keep it off the event loop
+            spool = await asyncio.to_thread(_build_xlsx, emails)
         except ImportError:
             raise HTTPException(
                 status_code=500,
                 detail="XLSX export requires openpyxl. Install with: pip install openpyxl"
             )
+        content = _file_chunks(spool)
     
-    return FileResponse(
-        path=export_path,
-        filename=f"{filename}.{format}",
-        media_type="application/octet-stream"
+    return StreamingResponse(
+        content,
+        media_type="application/octet-stream",
+        headers=headers
     )
 
 
@@ -591,6 +778,7 @@ async def delete_results(job_id: str):
         raise HTTPException(status_code=404, detail="Job not found")
     
     del results_store[job_id]
+    forget_fingerprint(job_id)
     return {"message": "Results deleted successfully"}
 
 
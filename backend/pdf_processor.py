@@ -2,13 +2,27 @@
 PDF Processor Module
 Handles text extraction from PDF files, including OCR for scanned documents.
 """
+import os
+import re
+import time
+import shutil
 import logging
+import subprocess
+import unicodedata
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
 from pathlib import Path
 from typing import Optional
-import io
 
 logger = logging.getLogger(__name__)
 
+# Invisible characters that split words in extracted text: soft hyphen,
+# zero-width space/non-joiner/joiner, word joiner and BOM
+_INVISIBLE_CHARS = str.maketrans("", "", "\u00ad\u200b\u200c\u200d\u2060\ufeff")
+
+# Emails recovered from OCR passes, appended so none is lost between strategies
+_EMAIL_RE = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+
 
 class PDFProcessor:
     """
@@ -16,61 +30,162 @@ class PDFProcessor:
     Supports both text-based and scanned/image-based PDFs.
     """
     
-    def __init__(self, enable_ocr: bool = True, ocr_language: str = "eng"):
+    # Seconds before a pdftotext run is abandoned for the Python extractors
+    PDFTOTEXT_TIMEOUT = 120
+    
+    # Single text block, LSTM engine. Tesseract 5 binarizes raw grayscale
+    # input itself (thresholding_method=1: Leptonica's tiled Otsu); invert
+    # detection is skipped since scans are dark text on a light background
+    TESSERACT_CONFIG = '--psm 6 --oem 3 -c tessedit_do_invert=0 -c thresholding_method=1'
+    
+    # Mean word confidence (0-100) at which an OCR pass is accepted
+    # without trying the remaining preprocessing strategies
+    OCR_CONFIDENCE_THRESHOLD = 75
+    
+    # Scanned pages are rendered at OCR_ZOOM (~144 DPI) and re-rendered at
+    # OCR_MAX_ZOOM (~288 DPI) only when confidence stays below this value
+    OCR_ZOOM = 2
+    OCR_MAX_ZOOM = 4
+    OCR_ESCALATION_CONFIDENCE = 60
+    
+    # Pages whose text layer has fewer characters than this are OCR'd
+    OCR_PAGE_MIN_CHARS = 50
+    
+    # Pages a text pass reads before it may give up on a scanned-looking PDF
+    SCANNED_SAMPLE_PAGES = 5
+    
+    # Documents longer than this have their PyMuPDF text pass split
+    # across worker processes once the scanned-PDF sample is read
+    PARALLEL_TEXT_MIN_PAGES = 32
+    
+    # Optional dependencies (None when missing), filled in by _check_dependencies
+    pdftotext = None
+    pdfplumber = None
+    fitz = None
+    tesserocr = None
+    pytesseract = None
+    Image = None
+    _render_matrices = {}
+    _dependencies_checked = False
+    _ocr_dependencies_checked = False
+    
+    def __init__(self, enable_ocr: bool = True, ocr_language: str = "eng",
+                 max_workers: Optional[int] = None, prefer_tables: bool = False):
         """
         Initialize PDF processor.
         
         Args:
             enable_ocr: Whether to use OCR for image-based PDFs
             ocr_language: Language code for OCR (default: English)
+            max_workers: Processes used to OCR pages in parallel (default: CPU count)
+            prefer_tables: Read text with pdfplumber (layout/table aware, much
+                slower) before pdftotext and PyMuPDF
         """
         self.enable_ocr = enable_ocr
         self.ocr_language = ocr_language
+        self.prefer_tables = prefer_tables
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # tesserocr API handle, created on first OCR call (loads the model once)
+        self._tess_api = None
+        # PyMuPDF documents kept open while extract_text runs (path -> doc)
+        self._documents: Optional[dict] = None
         self._check_dependencies()
     
     def _check_dependencies(self) -> None:
-        """Check if required libraries are available."""
-        try:
-            import pdfplumber
-            self.pdfplumber = pdfplumber
-        except ImportError:
-            logger.warning("pdfplumber not installed. Install with: pip install pdfplumber")
-            self.pdfplumber = None
-        
-        try:
-            import fitz  # PyMuPDF
-            self.fitz = fitz
-        except ImportError:
-            logger.warning("PyMuPDF not installed. Install with: pip install PyMuPDF")
-            self.fitz = None
+        """
+        Check if required libraries are available. The probes run once per
+        process; results are stored on the class and shared by all instances.
+        """
+        cls = type(self)
+        if not cls._dependencies_checked:
+            # Optional: poppler's pdftotext binary (native, much faster)
+            cls.pdftotext = shutil.which("pdftotext")
+            
+            try:
+                import pdfplumber
+                cls.pdfplumber = pdfplumber
+            except ImportError:
+                logger.warning("pdfplumber not installed. Install with: pip install pdfplumber")
+            
+            try:
+                import fitz  # PyMuPDF
+                cls.fitz = fitz
+                # Render transforms for OCR, built once instead of per page
+                cls._render_matrices = {
+                    zoom: fitz.Matrix(zoom, zoom) for zoom in (cls.OCR_ZOOM, cls.OCR_MAX_ZOOM)
+                }
+            except ImportError:
+                logger.warning("PyMuPDF not installed. Install with: pip install PyMuPDF")
+            
+            cls._dependencies_checked = True
         
-        if self.enable_ocr:
+        if self.enable_ocr and not cls._ocr_dependencies_checked:
             try:
-                import pytesseract
+                # Preferred: tesserocr runs Tesseract in-process, avoiding a
+                # subprocess and temp image file per call
+                import tesserocr
                 from PIL import Image
-                self.pytesseract = pytesseract
-                self.Image = Image
-                
-                # Configure Tesseract path for Windows
-                import platform
-                if platform.system() == 'Windows':
-                    tesseract_path = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
-                    import os
-                    if os.path.exists(tesseract_path):
-                        pytesseract.pytesseract.tesseract_cmd = tesseract_path
+                cls.tesserocr = tesserocr
+                cls.Image = Image
             except ImportError:
-                logger.warning("OCR libraries not installed. Install with: pip install pytesseract Pillow")
-                self.pytesseract = None
-                self.Image = None
+                try:
+                    import pytesseract
+                    from PIL import Image
+                    cls.pytesseract = pytesseract
+                    cls.Image = Image
+                    
+                    # Configure Tesseract path for Windows
+                    import platform
+                    if platform.system() == 'Windows':
+                        tesseract_path = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+                        if os.path.exists(tesseract_path):
+                            pytesseract.pytesseract.tesseract_cmd = tesseract_path
+                except ImportError:
+                    logger.warning("OCR libraries not installed. Install with: pip install tesserocr Pillow (or pytesseract)")
+            
+            cls._ocr_dependencies_checked = True
+    
+    def _close_document(self, doc) -> None:
+        """Close a PyMuPDF document and trim MuPDF's shared resource store."""
+        try:
+            doc.close()
+        finally:
+            # Fonts and images decoded for the document stay cached
+            # process-wide (up to MuPDF's 256 MB default) until shrunk
+            self.fitz.TOOLS.store_shrink(100)
+    
+    @contextmanager
+    def _open_document(self, pdf_path: str):
+        """
+        Open a PDF with PyMuPDF. While extract_text runs the handle is cached,
+        so its text and OCR passes share one parsed document; otherwise it is
+        closed on exit.
+        """
+        if self._documents is not None:
+            doc = self._documents.get(pdf_path)
+            if doc is None:
+                doc = self._documents[pdf_path] = self.fitz.open(pdf_path)
+            yield doc
+            return
+        
+        doc = self.fitz.open(pdf_path)
+        try:
+            yield doc
+        finally:
+            self._close_document(doc)
+    
+    def _release_documents(self) -> None:
+        """Close the documents cached by _open_document and stop caching."""
+        documents, self._documents = self._documents or {}, None
+        for doc in documents.values():
+            self._close_document(doc)
     
     def get_page_count(self, pdf_path: str) -> int:
         """Get the number of pages in a PDF."""
         try:
             if self.fitz:
-                doc = self.fitz.open(pdf_path)
-                count = len(doc)
-                doc.close()
-                return count
+                with self._open_document(pdf_path) as doc:
+                    return len(doc)
             elif self.pdfplumber:
                 with self.pdfplumber.open(pdf_path) as pdf:
                     return len(pdf.pages)
@@ -96,235 +211,521 @@ class PDFProcessor:
         if not path.suffix.lower() == ".pdf":
             raise ValueError(f"Invalid file type: {path.suffix}")
         
-        text = ""
-        actual_content_length = 0  # Track actual content, not including page markers
+        ocr_available = self.enable_ocr and (self.tesserocr or self.pytesseract)
+        # Stopping early on scanned-looking PDFs is only safe when OCR
+        # will cover the pages left unread
+        early_exit_chars = self.OCR_PAGE_MIN_CHARS if ocr_available else 0
         
-        # Try pdfplumber first (better for text-based PDFs)
-        if self.pdfplumber:
-            text, actual_content_length = self._extract_with_pdfplumber(pdf_path, progress_callback)
+        # PyMuPDF documents stay open across the text and OCR passes
+        self._documents = {}
+        try:
+            # One text pass with the fastest available extractor; the others
+            # only run if it fails outright, not merely when text is sparse
+            page_texts = None
+            if self.prefer_tables and self.pdfplumber:
+                page_texts = self._extract_with_pdfplumber(pdf_path, progress_callback, early_exit_chars)
+            if page_texts is None and self.pdftotext:
+                page_texts = self._extract_with_pdftotext(pdf_path, progress_callback)
+            if page_texts is None and self.fitz:
+                page_texts = self._extract_with_pymupdf(pdf_path, progress_callback, early_exit_chars)
+            if page_texts is None and self.pdfplumber and not self.prefer_tables:
+                page_texts = self._extract_with_pdfplumber(pdf_path, progress_callback, early_exit_chars)
+            
+            # Content length of each page's text layer, measured once
+            page_lengths = [len(page_text.strip()) for page_text in page_texts or ()]
+            
+            # OCR just the pages whose text layer is (nearly) empty, or every
+            # page when no text extractor could read the file
+            ocr_texts = {}
+            if ocr_available:
+                if page_texts is None:
+                    ocr_pages = None
+                else:
+                    ocr_pages = [
+                        page_num for page_num, length in enumerate(page_lengths)
+                        if length < self.OCR_PAGE_MIN_CHARS
+                    ]
+                if ocr_pages is None or ocr_pages:
+                    logger.info("Text extraction minimal, attempting OCR...")
+                    ocr_texts = self._extract_with_ocr(pdf_path, ocr_pages, progress_callback)
+        finally:
+            self._release_documents()
         
-        # If pdfplumber failed or got minimal text, try PyMuPDF
-        if actual_content_length < 50 and self.fitz:
-            fitz_text, fitz_content_length = self._extract_with_pymupdf(pdf_path, progress_callback)
-            if fitz_content_length > actual_content_length:
-                text = fitz_text
-                actual_content_length = fitz_content_length
+        page_texts = page_texts or []
+        text_parts = []
+        for page_num in sorted(set(range(len(page_texts))) | ocr_texts.keys()):
+            page_text = page_texts[page_num] if page_num < len(page_texts) else ""
+            page_length = page_lengths[page_num] if page_num < len(page_lengths) else 0
+            ocr_text = ocr_texts.get(page_num, "")
+            if ocr_text and len(ocr_text.strip()) > page_length:
+                text_parts.append(f"--- Page {page_num + 1} (OCR) ---")
+                text_parts.extend(self._clean_lines(ocr_text))
+            elif page_length:
+                text_parts.append(f"--- Page {page_num + 1} ---")
+                text_parts.extend(self._clean_lines(page_text))
         
-        # If still minimal text and OCR is enabled, try OCR
-        if actual_content_length < 50 and self.enable_ocr and self.pytesseract:
-            logger.info("Text extraction minimal, attempting OCR...")
-            ocr_text, ocr_content_length = self._extract_with_ocr(pdf_path, progress_callback)
-            if ocr_content_length > actual_content_length:
-                text = ocr_text
+        return "\n".join(text_parts)
+    
+    def _extract_with_pdftotext(self, pdf_path: str, progress_callback=None) -> Optional[list]:
+        """Extract text using the pdftotext binary. Returns one string per page, or None on failure."""
+        try:
+            completed = subprocess.run(
+                [self.pdftotext, "-q", "-enc", "UTF-8", pdf_path, "-"],
+                capture_output=True, check=True, timeout=self.PDFTOTEXT_TIMEOUT
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.warning(f"pdftotext extraction failed: {e}")
+            return None
         
-        return self._clean_text(text)
+        # Pages are separated by form feeds; the last one ends the output
+        pages = completed.stdout.decode("utf-8", "replace").split("\f")
+        if pages and not pages[-1].strip():
+            pages.pop()
+        
+        if progress_callback and pages:
+            progress_callback(len(pages), len(pages))
+        return pages
     
-    def _extract_with_pdfplumber(self, pdf_path: str, progress_callback=None) -> tuple:
-        """Extract text using pdfplumber. Returns (text, actual_content_length)."""
-        text_parts = []
-        actual_content_length = 0
+    def _looks_scanned(self, pages_read: int, content_length: int, early_exit_chars: int) -> bool:
+        """
+        True once a text pass is clearly trending empty: after the first
+        SCANNED_SAMPLE_PAGES pages, fewer than early_exit_chars / 10
+        characters per page (0 disables the check).
+        """
+        return (
+            early_exit_chars > 0
+            and pages_read >= self.SCANNED_SAMPLE_PAGES
+            and content_length < early_exit_chars * pages_read / 10
+        )
+    
+    def _extract_with_pdfplumber(self, pdf_path: str, progress_callback=None,
+                                 early_exit_chars: int = 50) -> Optional[list]:
+        """
+        Extract text using pdfplumber. Returns one string per page, or None on failure.
+        Stops reading a document that looks scanned (see _looks_scanned); the
+        unread pages come back empty.
+        """
+        page_texts = []
+        content_length = 0
         
         try:
             with self.pdfplumber.open(pdf_path) as pdf:
                 total_pages = len(pdf.pages)
                 for page_num, page in enumerate(pdf.pages, 1):
+                    if progress_callback:
+                        progress_callback(page_num, total_pages)
+                    
                     try:
-                        if progress_callback:
-                            progress_callback(page_num, total_pages)
-                        
-                        page_text = page.extract_text() or ""
-                        if page_text:
-                            text_parts.append(f"--- Page {page_num} ---\n{page_text}")
-                            actual_content_length += len(page_text.strip())
-                        
                         # Note: We skip table extraction here because extract_text() 
                         # already includes table content, extracting tables separately
                         # would cause duplicate emails to be counted
-                        
+                        page_texts.append(page.extract_text() or "")
                     except Exception as e:
                         logger.warning(f"Error extracting page {page_num}: {e}")
-                        continue
+                        page_texts.append("")
+                    
+                    content_length += len(page_texts[-1].strip())
+                    if self._looks_scanned(page_num, content_length, early_exit_chars):
+                        page_texts.extend([""] * (total_pages - page_num))
+                        break
         except Exception as e:
             logger.error(f"pdfplumber extraction failed: {e}")
+            return None
         
-        return "\n".join(text_parts), actual_content_length
+        return page_texts
     
-    def _extract_with_pymupdf(self, pdf_path: str, progress_callback=None) -> tuple:
-        """Extract text using PyMuPDF (fitz). Returns (text, actual_content_length)."""
-        text_parts = []
-        actual_content_length = 0
+    def _extract_with_pymupdf(self, pdf_path: str, progress_callback=None,
+                              early_exit_chars: int = 50) -> Optional[list]:
+        """
+        Extract text using PyMuPDF (fitz). Returns one string per page, or None on failure.
+        Stops reading a document that looks scanned (see _looks_scanned); the
+        unread pages come back empty.
+        """
+        page_texts = []
+        content_length = 0
         
         try:
-            doc = self.fitz.open(pdf_path)
-            total_pages = len(doc)
-            for page_num in range(total_pages):
-                try:
+            with self._open_document(pdf_path) as doc:
+                total_pages = len(doc)
+                shard = total_pages > self.PARALLEL_TEXT_MIN_PAGES and self.max_workers > 1
+                for page_num in range(total_pages):
                     if progress_callback:
                         progress_callback(page_num + 1, total_pages)
                     
-                    page = doc.load_page(page_num)
-                    page_text = page.get_text("text")
-                    if page_text:
-                        text_parts.append(f"--- Page {page_num + 1} ---\n{page_text}")
-                        actual_content_length += len(page_text.strip())
-                except Exception as e:
-                    logger.warning(f"Error extracting page {page_num + 1}: {e}")
-                    continue
-            doc.close()
+                    page_texts.append(self._page_text(doc, page_num))
+                    
+                    content_length += len(page_texts[-1].strip())
+                    if self._looks_scanned(page_num + 1, content_length, early_exit_chars):
+                        page_texts.extend([""] * (total_pages - page_num - 1))
+                        break
+                    
+                    # Long text PDF: hand the remaining pages to worker processes
+                    if shard and page_num + 1 == self.SCANNED_SAMPLE_PAGES:
+                        page_texts.extend(self._extract_pages_sharded(
+                            pdf_path, page_num + 1, total_pages, progress_callback
+                        ))
+                        break
         except Exception as e:
             logger.error(f"PyMuPDF extraction failed: {e}")
+            return None
         
-        return "\n".join(text_parts), actual_content_length
+        return page_texts
     
-    def _extract_with_ocr(self, pdf_path: str, progress_callback=None) -> tuple:
-        """Extract text using OCR (for scanned PDFs). Returns (text, actual_content_length)."""
-        text_parts = []
-        actual_content_length = 0
+    def _page_text(self, doc, page_num: int) -> str:
+        """Plain text of one page of an open PyMuPDF document ("" on error)."""
+        try:
+            page = doc.load_page(page_num)
+            return page.get_text("text")
+        except Exception as e:
+            logger.warning(f"Error extracting page {page_num + 1}: {e}")
+            return ""
+    
+    def _extract_pages_sharded(self, pdf_path: str, start: int, total_pages: int,
+                               progress_callback=None) -> list:
+        """
+        Extract pages [start, total_pages) with PyMuPDF in worker processes,
+        one contiguous page range and document handle per worker.
+        PyMuPDF holds the GIL during extraction, so threads would not help.
+        """
+        workers = min(self.max_workers, total_pages - start)
+        step = -(-(total_pages - start) // workers)
+        ranges = [(first, min(first + step, total_pages)) for first in range(start, total_pages, step)]
+        
+        results = {}
+        with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = {
+                executor.submit(_pymupdf_pages_worker, pdf_path, first, stop): (first, stop)
+                for first, stop in ranges
+            }
+            done = start
+            for future in as_completed(futures):
+                first, stop = futures[future]
+                try:
+                    results[first] = future.result()
+                except Exception as e:
+                    logger.warning(f"Error extracting pages {first + 1}-{stop}: {e}")
+                    results[first] = [""] * (stop - first)
+                
+                done += stop - first
+                if progress_callback:
+                    progress_callback(done, total_pages)
+        
+        return [page_text for first in sorted(results) for page_text in results[first]]
+    
+    def _extract_with_ocr(self, pdf_path: str, page_numbers: Optional[list] = None,
+                          progress_callback=None) -> dict:
+        """
+        Extract text using OCR (for scanned PDFs).
+        
+        Args:
+            pdf_path: Path to the PDF file
+            page_numbers: 0-based pages to OCR (default: all pages)
+            progress_callback: Optional callback function(pages_done, pages_to_ocr)
+            
+        Returns:
+            Dict mapping 0-based page number to its OCR text
+        """
+        ocr_texts = {}
         
         try:
             if self.fitz:
-                doc = self.fitz.open(pdf_path)
-                total_pages = len(doc)
-                for page_num in range(total_pages):
-                    try:
-                        if progress_callback:
-                            progress_callback(page_num + 1, total_pages)
-                        
-                        page = doc.load_page(page_num)
-                        # Render page to image with optimal resolution for OCR
-                        # Using 4x zoom (equivalent to ~288 DPI) - higher for better OCR accuracy
-                        pix = page.get_pixmap(matrix=self.fitz.Matrix(4, 4))
-                        img_data = pix.tobytes("png")
-                        
-                        # OCR the image with preprocessing
-                        image = self.Image.open(io.BytesIO(img_data))
-                        page_text = self._ocr_with_preprocessing(image)
-                        
-                        if page_text.strip():
-                            text_parts.append(f"--- Page {page_num + 1} (OCR) ---\n{page_text}")
-                            actual_content_length += len(page_text.strip())
-                    except Exception as e:
-                        logger.warning(f"OCR error on page {page_num + 1}: {e}")
-                        continue
-                doc.close()
+                with self._open_document(pdf_path) as doc:
+                    if page_numbers is None:
+                        page_numbers = range(len(doc))
+                    # page_num -> (confidence, text) of the best pass so far
+                    page_results = {}
+                    
+                    # Pages are rendered here (PyMuPDF isn't thread-safe) and
+                    # OCR'd inline or in worker processes. Tesseract's own OpenMP
+                    # threads would oversubscribe the cores, so limit it to one.
+                    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+                    workers = max(1, min(self.max_workers, len(page_numbers)))
+                    if workers == 1:
+                        # No pool: a single worker would only add a process
+                        # spawn and a model load per document
+                        self._ocr_pages_inline(doc, page_numbers, page_results, progress_callback)
+                    else:
+                        self._ocr_pages_pooled(doc, page_numbers, page_results, workers,
+                                               progress_callback)
+                
+                for page_num, (_, page_text) in page_results.items():
+                    ocr_texts[page_num] = page_text
             else:
                 # Fallback: convert PDF to images using pdf2image if available
                 try:
                     from pdf2image import convert_from_path
-                    images = convert_from_path(pdf_path, dpi=400)  # Higher DPI for better OCR
-                    for i, image in enumerate(images, 1):
-                        page_text = self._ocr_with_preprocessing(image)
-                        if page_text.strip():
-                            text_parts.append(f"--- Page {i} (OCR) ---\n{page_text}")
-                            actual_content_length += len(page_text.strip())
+                    if page_numbers is None:
+                        images = enumerate(convert_from_path(pdf_path, dpi=400))  # Higher DPI for better OCR
+                    else:
+                        images = (
+                            (page_num, convert_from_path(
+                                pdf_path, dpi=400, first_page=page_num + 1, last_page=page_num + 1
+                            )[0])
+                            for page_num in page_numbers
+                        )
+                    for page_num, image in images:
+                        ocr_texts[page_num], _ = self._ocr_with_preprocessing(image)
                 except ImportError:
                     logger.error("pdf2image not installed for OCR fallback")
                     
         except Exception as e:
             logger.error(f"OCR extraction failed: {e}")
         
-        return "\n".join(text_parts), actual_content_length
+        return ocr_texts
     
-    def _clean_text(self, text: str) -> str:
-        """Clean and normalize extracted text."""
+    def _ocr_pages_pooled(self, doc, page_numbers, page_results: dict, workers: int,
+                          progress_callback=None) -> None:
+        """
+        OCR pages of an open document in a process pool, keeping the best
+        (confidence, text) per page in page_results.
+        """
+        total_pages = len(page_numbers)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            
+            def submit(page_num, zoom):
+                try:
+                    page = doc.load_page(page_num)
+                    pix = page.get_pixmap(matrix=self._render_matrices[zoom])
+                    # Ship the raw pixel buffer; no PNG encode/decode
+                    future = executor.submit(
+                        _ocr_worker, pix.samples, pix.width, pix.height, pix.n,
+                        self.ocr_language
+                    )
+                    pix = None
+                    futures[future] = (page_num, zoom)
+                    return True
+                except Exception as e:
+                    logger.warning(f"OCR error on page {page_num + 1}: {e}")
+                    return False
+            
+            # Render ahead only a bounded window of pages so pixel
+            # buffers can't pile up faster than the workers drain them;
+            # rendering the next page overlaps OCR of the queued ones
+            max_in_flight = 2 * workers
+            pending = iter(page_numbers)
+            done = 0
+            while True:
+                while len(futures) < max_in_flight:
+                    page_num = next(pending, None)
+                    if page_num is None:
+                        break
+                    if not submit(page_num, self.OCR_ZOOM):
+                        # Pages that failed to render count as done
+                        done += 1
+                if not futures:
+                    break
+                
+                finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    page_num, zoom = futures.pop(future)
+                    try:
+                        page_text, confidence = future.result()
+                        if confidence > page_results.get(page_num, (-1.0,))[0]:
+                            page_results[page_num] = (confidence, page_text)
+                        
+                        # Low confidence at the cheap resolution: retry at full zoom
+                        if (confidence < self.OCR_ESCALATION_CONFIDENCE
+                                and zoom < self.OCR_MAX_ZOOM
+                                and submit(page_num, self.OCR_MAX_ZOOM)):
+                            continue
+                    except Exception as e:
+                        logger.warning(f"OCR error on page {page_num + 1}: {e}")
+                    
+                    done += 1
+                    if progress_callback:
+                        progress_callback(done, total_pages)
+    
+    def _ocr_pages_inline(self, doc, page_numbers, page_results: dict,
+                          progress_callback=None) -> None:
+        """
+        In-process counterpart of _ocr_pages_pooled. _ocr_worker keeps one
+        processor per language in this process, so the Tesseract model is
+        loaded once and reused across documents.
+        """
+        total_pages = len(page_numbers)
+        for done, page_num in enumerate(page_numbers, 1):
+            for zoom in (self.OCR_ZOOM, self.OCR_MAX_ZOOM):
+                try:
+                    page = doc.load_page(page_num)
+                    pix = page.get_pixmap(matrix=self._render_matrices[zoom])
+                    page_text, confidence = _ocr_worker(
+                        pix.samples, pix.width, pix.height, pix.n, self.ocr_language
+                    )
+                    pix = None
+                except Exception as e:
+                    logger.warning(f"OCR error on page {page_num + 1}: {e}")
+                    break
+                
+                if confidence > page_results.get(page_num, (-1.0,))[0]:
+                    page_results[page_num] = (confidence, page_text)
+                
+                # Low confidence at the cheap resolution: retry at full zoom
+                if confidence >= self.OCR_ESCALATION_CONFIDENCE:
+                    break
+            
+            if progress_callback:
+                progress_callback(done, total_pages)
+    
+    def _clean_lines(self, text: str):
+        """
+        Clean and normalize extracted text, yielding its non-empty lines.
+        Extractors clean page by page so the document is joined only once.
+        """
         if not text:
-            return ""
+            return
         
-        # Normalize whitespace
-        lines = text.split("\n")
-        cleaned_lines = []
+        # Fold ligatures and compatibility forms (e.g. "\ufb01" -> "fi",
+        # NBSP -> space, fullwidth "\uff20" -> "@") and drop invisible
+        # characters; pure ASCII text has neither
+        if not text.isascii():
+            text = unicodedata.normalize("NFKC", text).translate(_INVISIBLE_CHARS)
         
-        for line in lines:
+        # Normalize whitespace
+        for line in text.split("\n"):
             # Remove excessive whitespace but preserve structure
             line = " ".join(line.split())
             if line:
-                cleaned_lines.append(line)
+                yield line
+    
+    def _image_to_string(self, image) -> str:
+        """Run Tesseract on a PIL image with the settings in TESSERACT_CONFIG."""
+        if self.tesserocr:
+            if self._tess_api is None:
+                self._tess_api = self.tesserocr.PyTessBaseAPI(
+                    lang=self.ocr_language,
+                    psm=self.tesserocr.PSM.SINGLE_BLOCK,
+                    oem=self.tesserocr.OEM.DEFAULT
+                )
+                self._tess_api.SetVariable("tessedit_do_invert", "0")
+                self._tess_api.SetVariable("thresholding_method", "1")
+            self._tess_api.SetImage(image)
+            return self._tess_api.GetUTF8Text()
         
-        return "\n".join(cleaned_lines)
+        return self.pytesseract.image_to_string(
+            image,
+            lang=self.ocr_language,
+            config=self.TESSERACT_CONFIG
+        )
     
-    def _ocr_with_preprocessing(self, image) -> str:
+    def _image_to_string_with_confidence(self, image) -> tuple:
+        """Like _image_to_string, but also returns the mean word confidence (0-100)."""
+        if self.tesserocr:
+            text = self._image_to_string(image)
+            return text, self._tess_api.MeanTextConf()
+        
+        data = self.pytesseract.image_to_data(
+            image,
+            lang=self.ocr_language,
+            config=self.TESSERACT_CONFIG,
+            output_type=self.pytesseract.Output.DICT
+        )
+        
+        # Rebuild the text line by line from the word boxes
+        lines = {}
+        confidences = []
+        for i, word in enumerate(data["text"]):
+            conf = float(data["conf"][i])
+            if conf < 0 or not word.strip():
+                continue
+            confidences.append(conf)
+            key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+            lines.setdefault(key, []).append(word)
+        
+        text = "\n".join(" ".join(words) for words in lines.values())
+        mean_conf = sum(confidences) / len(confidences) if confidences else 0.0
+        return text, mean_conf
+    
+    def _as_pil(self, image):
+        """Return image as a PIL image (wrapping pixel arrays without re-encoding)."""
+        if isinstance(image, self.Image.Image):
+            return image
+        return self.Image.fromarray(image)
+    
+    def _to_grayscale(self, img_array):
+        """Convert a page image array to grayscale once, for reuse by every strategy."""
+        import cv2
+        
+        if img_array.ndim == 3:
+            code = cv2.COLOR_RGBA2GRAY if img_array.shape[2] == 4 else cv2.COLOR_RGB2GRAY
+            return cv2.cvtColor(img_array, code)
+        return img_array
+    
+    def _otsu_binarize(self, gray):
+        """Global Otsu binarization of a grayscale page in one histogram pass."""
+        import numpy as np
+        
+        # Otsu's threshold from the 256-bin histogram: evaluate the
+        # between-class variance for every candidate level at once
+        hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+        prob = hist / hist.sum()
+        weight = np.cumsum(prob)
+        mean = np.cumsum(prob * np.arange(256))
+        spread = weight * (1.0 - weight)
+        variance = np.divide(
+            (mean[-1] * weight - mean) ** 2, spread,
+            out=np.zeros(256), where=spread > 0
+        )
+        threshold = int(np.argmax(variance))
+        
+        return np.where(gray > threshold, 255, 0).astype(np.uint8)
+    
+    def _ocr_with_preprocessing(self, image) -> tuple:
         """
         Apply optimized image preprocessing and OCR for fast, accurate text extraction.
-        Uses three complementary strategies for good coverage with acceptable speed.
+        Tries up to three complementary strategies, stopping at the first one
+        whose mean word confidence clears OCR_CONFIDENCE_THRESHOLD.
+        Accepts a PIL image or a (height, width[, channels]) uint8 array.
+        Returns (text, best mean word confidence).
         """
-        import re
-        all_emails = set()
         all_text_parts = []
+        best_confidence = 0.0
         
         try:
             import cv2
             import numpy as np
             
-            # Convert PIL Image to OpenCV format
-            img_array = np.array(image)
-            
-            # Convert to grayscale if needed
-            if len(img_array.shape) == 3:
-                gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
-            else:
-                gray = img_array
-            
-            # Strategy 1: OTSU thresholding - good for clear documents
-            _, otsu = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-            pil_otsu = self.Image.fromarray(otsu)
-            text1 = self.pytesseract.image_to_string(
-                pil_otsu, 
-                lang=self.ocr_language,
-                config='--psm 6 --oem 3'
-            )
-            all_text_parts.append(text1)
+            # Convert PIL Image to OpenCV format (arrays are used as-is)
+            gray = self._to_grayscale(np.asarray(image))
             
-            # Strategy 2: Adaptive threshold - better for varied lighting/backgrounds
-            adaptive = cv2.adaptiveThreshold(
-                gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
+            strategies = (
+                # Strategy 1: Original grayscale - Tesseract binarizes it
+                # itself, so clean scans need no OpenCV work at all
+                lambda: gray,
+                # Strategy 2: OTSU thresholding - good for clear documents
+                lambda: self._otsu_binarize(gray),
+                # Strategy 3: Adaptive threshold - better for varied lighting/backgrounds
+                lambda: cv2.adaptiveThreshold(
+                    gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
+                ),
             )
-            pil_adaptive = self.Image.fromarray(adaptive)
-            text2 = self.pytesseract.image_to_string(
-                pil_adaptive, 
-                lang=self.ocr_language,
-                config='--psm 6 --oem 3'
-            )
-            all_text_parts.append(text2)
             
-            # Strategy 3: Original grayscale - sometimes works best
-            pil_gray = self.Image.fromarray(gray)
-            text3 = self.pytesseract.image_to_string(
-                pil_gray, 
-                lang=self.ocr_language,
-                config='--psm 6 --oem 3'
-            )
-            all_text_parts.append(text3)
+            for preprocess in strategies:
+                text, confidence = self._image_to_string_with_confidence(
+                    self.Image.fromarray(preprocess())
+                )
+                all_text_parts.append(text)
+                best_confidence = max(best_confidence, confidence)
+                if confidence > self.OCR_CONFIDENCE_THRESHOLD:
+                    break
             
         except ImportError:
             # Fallback if OpenCV not available
             logger.debug("OpenCV not available, using original image for OCR")
-            text = self.pytesseract.image_to_string(
-                image, 
-                lang=self.ocr_language,
-                config='--psm 6 --oem 3'
-            )
-            return text
+            return self._image_to_string_with_confidence(self._as_pil(image))
         except Exception as e:
             logger.warning(f"Preprocessing failed, falling back to original: {e}")
-            text = self.pytesseract.image_to_string(
-                image, 
-                lang=self.ocr_language,
-                config='--psm 6 --oem 3'
-            )
-            return text
+            return self._image_to_string_with_confidence(self._as_pil(image))
         
-        # Extract unique emails from all strategies
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        for text in all_text_parts:
-            emails = re.findall(email_pattern, text)
-            all_emails.update(emails)
+        # Extract unique emails from the strategies that ran
+        all_emails = {m.group(0) for part in all_text_parts for m in _EMAIL_RE.finditer(part)}
         
         # Combine texts and append found emails
         combined_text = "\n".join(all_text_parts)
         if all_emails:
             combined_text += "\n--- Extracted Emails ---\n" + "\n".join(all_emails)
         
-        return combined_text
+        return combined_text, best_confidence
     
     def get_pdf_info(self, pdf_path: str) -> dict:
         """Get metadata about a PDF file."""
@@ -338,23 +739,22 @@ class PDFProcessor:
         
         try:
             if self.fitz:
-                doc = self.fitz.open(pdf_path)
-                info["pages"] = len(doc)
-                info["encrypted"] = doc.is_encrypted
-                
-                metadata = doc.metadata
-                if metadata:
-                    info["title"] = metadata.get("title")
-                    info["author"] = metadata.get("author")
-                
-                # Check for images
-                for page_num in range(min(3, len(doc))):  # Check first 3 pages
-                    page = doc.load_page(page_num)
-                    if page.get_images():
-                        info["has_images"] = True
-                        break
-                
-                doc.close()
+                with self._open_document(pdf_path) as doc:
+                    info["pages"] = len(doc)
+                    info["encrypted"] = doc.is_encrypted
+                    
+                    metadata = doc.metadata
+                    if metadata:
+                        info["title"] = metadata.get("title")
+                        info["author"] = metadata.get("author")
+                    
+                    # Check for images
+                    for page_num in range(min(3, len(doc))):  # Check first 3 pages
+                        page = doc.load_page(page_num)
+                        if page.get_images():
+                            info["has_images"] = True
+                            break
+                    page = None
                 
             elif self.pdfplumber:
                 with self.pdfplumber.open(pdf_path) as pdf:
@@ -367,3 +767,70 @@ class PDFProcessor:
             logger.error(f"Error getting PDF info: {e}")
         
         return info
+
+
+# Per-process processors used by process-pool workers
+_worker_processor: Optional[PDFProcessor] = None
+_ocr_processors: dict = {}
+
+# Minimum seconds between progress messages from one worker
+PROGRESS_INTERVAL = 0.1
+
+
+def _extract_text_worker(pdf_path: str, progress_queue=None, progress_key=None) -> str:
+    """
+    Process-pool entry point for PDFProcessor.extract_text.
+    
+    When progress_queue is given, page progress is sent on it as
+    (progress_key, current_page, total_pages) tuples, at most once per
+    PROGRESS_INTERVAL; the last page of a pass is always sent.
+    """
+    global _worker_processor
+    if _worker_processor is None:
+        # This already runs in one of the app's pool workers, so the pool is
+        # the parallelism; nested pools would start up to cpu_count**2
+        # processes under load
+        _worker_processor = PDFProcessor(max_workers=1)
+    
+    progress_callback = None
+    if progress_queue is not None:
+        last_sent = 0.0
+        
+        def progress_callback(current_page: int, total_pages: int):
+            nonlocal last_sent
+            now = time.monotonic()
+            if now - last_sent >= PROGRESS_INTERVAL or current_page == total_pages:
+                last_sent = now
+                progress_queue.put((progress_key, current_page, total_pages))
+    
+    return _worker_processor.extract_text(pdf_path, progress_callback=progress_callback)
+
+
+def _ocr_worker(samples: bytes, width: int, height: int, channels: int,
+                ocr_language: str) -> tuple:
+    """
+    Process-pool entry point that OCRs one rendered page from its raw
+    pixmap samples. Returns (text, confidence).
+    """
+    processor = _ocr_processors.get(ocr_language)
+    if processor is None:
+        processor = _ocr_processors[ocr_language] = PDFProcessor(ocr_language=ocr_language)
+    
+    try:
+        import numpy as np
+        shape = (height, width, channels) if channels > 1 else (height, width)
+        image = np.frombuffer(samples, dtype=np.uint8).reshape(shape)
+    except ImportError:
+        mode = {1: "L", 3: "RGB", 4: "RGBA"}[channels]
+        image = processor.Image.frombytes(mode, (width, height), samples)
+    return processor._ocr_with_preprocessing(image)
+
+
+def _pymupdf_pages_worker(pdf_path: str, start: int, stop: int) -> list:
+    """Process-pool entry point that extracts pages [start, stop) with its own document handle."""
+    processor = PDFProcessor(enable_ocr=False)
+    doc = processor.fitz.open(pdf_path)
+    try:
+        return [processor._page_text(doc, page_num) for page_num in range(start, stop)]
+    finally:
+        processor._close_document(doc)
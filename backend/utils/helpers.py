@@ -2,10 +2,11 @@
 Helper utility functions for the PDF Email Extractor.
 """
 import os
+import stat
 import time
+import uuid
 import logging
 from pathlib import Path
-from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
@@ -21,22 +22,30 @@ def cleanup_old_files(directory: Path, max_age_seconds: int) -> int:
     Returns:
         Number of files deleted
     """
-    if not directory.exists():
-        return 0
-    
     deleted_count = 0
     current_time = time.time()
     
-    for file_path in directory.iterdir():
-        if file_path.is_file() and file_path.name != '.gitkeep':
+    try:
+        entries = os.scandir(directory)
+    except FileNotFoundError:
+        return 0
+    
+    # One stat() per entry supplies both the file type and the mtime
+    with entries:
+        for entry in entries:
+            if entry.name == '.gitkeep':
+                continue
             try:
-                file_age = current_time - file_path.stat().st_mtime
+                st = entry.stat()
+                if not stat.S_ISREG(st.st_mode):
+                    continue
+                file_age = current_time - st.st_mtime
                 if max_age_seconds == 0 or file_age > max_age_seconds:
-                    file_path.unlink()
+                    os.unlink(entry.path)
                     deleted_count += 1
-                    logger.debug(f"Deleted old file: {file_path}")
+                    logger.debug(f"Deleted old file: {entry.path}")
             except Exception as e:
-                logger.warning(f"Could not delete {file_path}: {e}")
+                logger.warning(f"Could not delete {entry.path}: {e}")
     
     if deleted_count > 0:
         logger.info(f"Cleaned up {deleted_count} old files from {directory}")
@@ -55,20 +64,27 @@ def generate_unique_filename(base_name: str, directory: Path) -> str:
     Returns:
         Unique filename
     """
-    stem = Path(base_name).stem
-    suffix = Path(base_name).suffix
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    
-    unique_name = f"{stem}_{timestamp}{suffix}"
-    counter = 1
+    base = Path(base_name)
+    stem = base.stem
+    suffix = base.suffix
     
+    # A nanosecond stamp is practically never taken already; the check only
+    # guards against overwriting a file on a clock collision
+    unique_name = f"{stem}_{time.time_ns():x}{suffix}"
     while (directory / unique_name).exists():
-        unique_name = f"{stem}_{timestamp}_{counter}{suffix}"
-        counter += 1
+        unique_name = f"{stem}_{time.time_ns():x}{suffix}"
     
     return unique_name
 
 
+# Path separators and shell/Windows-reserved characters become '_', null bytes
+# are removed
+_SANITIZE_TABLE = str.maketrans({
+    **{char: '_' for char in '/\\<>:"|?*'},
+    '\x00': None,
+})
+
+
 def sanitize_filename(filename: str) -> str:
     """
     Sanitize a filename to remove potentially dangerous characters.
@@ -79,16 +95,8 @@ def sanitize_filename(filename: str) -> str:
     Returns:
         Sanitized filename
     """
-    # Remove path separators
-    filename = filename.replace('/', '_').replace('\\', '_')
-    
-    # Remove null bytes
-    filename = filename.replace('\x00', '')
-    
-    # Remove other dangerous characters
-    dangerous_chars = '<>:"|?*'
-    for char in dangerous_chars:
-        filename = filename.replace(char, '_')
+    # Replace path separators and other dangerous characters, drop null bytes
+    filename = filename.translate(_SANITIZE_TABLE)
     
     # Limit length
     if len(filename) > 200:
@@ -99,6 +107,10 @@ def sanitize_filename(filename: str) -> str:
     return filename
 
 
+# Display format per power-of-1024 unit, used by format_file_size
+_FILE_SIZE_FORMATS = ("{} B", "{:.1f} KB", "{:.1f} MB", "{:.2f} GB")
+
+
 def format_file_size(size_bytes: int) -> str:
     """
     Format file size in human-readable format.
@@ -109,14 +121,13 @@ def format_file_size(size_bytes: int) -> str:
     Returns:
         Formatted string (e.g., "1.5 MB")
     """
-    if size_bytes < 1024:
-        return f"{size_bytes} B"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.1f} KB"
-    elif size_bytes < 1024 * 1024 * 1024:
-        return f"{size_bytes / (1024 * 1024):.1f} MB"
-    else:
-        return f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
+    # Each unit is 2**10 of the previous one, so the bit length of the
+    # magnitude picks it; the sign and any fraction stay in the value shown
+    magnitude = int(abs(size_bytes))
+    unit = min(max(magnitude.bit_length() - 1, 0) // 10, len(_FILE_SIZE_FORMATS) - 1)
+    if unit == 0:
+        return _FILE_SIZE_FORMATS[0].format(size_bytes)
+    return _FILE_SIZE_FORMATS[unit].format(size_bytes / (1 << (10 * unit)))
 
 
 def setup_logging(log_level: str = "INFO") -> None:
@@ -143,7 +154,6 @@ def is_valid_uuid(uuid_string: str) -> bool:
     Returns:
         True if valid UUID, False otherwise
     """
-    import uuid
     try:
         uuid.UUID(uuid_string)
         return True
@@ -4,18 +4,150 @@ Validates email addresses using multiple layers: syntax, domain, DNS/MX.
 Provides confidence scoring for each email.
 """
 import re
+import json
+import time
 import socket
+import string
 import logging
-from typing import Optional
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from functools import lru_cache
+from typing import Optional
+
+try:
+    import dns.resolver
+except ImportError:  # dnspython is optional
+    dns = None
 
 from .config import (
     ENABLE_DNS_LOOKUP, DNS_TIMEOUT, 
-    EMAIL_BLACKLIST, DOMAIN_BLACKLIST, KNOWN_VALID_DOMAINS
+    MX_CACHE_TTL, MX_NEGATIVE_CACHE_TTL, MX_CACHE_MAXSIZE, MX_CACHE_FILE,
+    MX_LOOKUP_WORKERS, DOMAIN_CHECK_CACHE_SIZE, VALIDATION_CACHE_SIZE,
+    EMAIL_BLACKLIST, KNOWN_VALID_DOMAINS, is_blacklisted_domain
 )
 
 logger = logging.getLogger(__name__)
 
+# MX lookup results shared by every validator: domain -> (expires_at, result).
+# Expiry uses wall-clock time so entries saved to disk stay meaningful.
+_mx_cache: OrderedDict = OrderedDict()
+_mx_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _get_resolver(timeout: float) -> "dns.resolver.Resolver":
+    """
+    Return a shared resolver for the given timeout.
+    
+    Built on first use rather than at import, since reading the system
+    resolver configuration can fail on hosts without one.
+    """
+    resolver = dns.resolver.Resolver()
+    resolver.timeout = timeout
+    resolver.lifetime = timeout
+    return resolver
+
+
+def _mx_cache_get(domain: str) -> Optional[dict]:
+    """Return the cached MX result for a domain, or None if absent/expired."""
+    with _mx_cache_lock:
+        entry = _mx_cache.get(domain)
+        if entry is None:
+            return None
+        if entry[0] <= time.time():
+            del _mx_cache[domain]
+            return None
+        _mx_cache.move_to_end(domain)
+        return entry[1]
+
+
+def _mx_cache_put(domain: str, result: dict) -> None:
+    """Cache an MX result; failures get the shorter negative TTL."""
+    ttl = MX_CACHE_TTL if result['valid'] else MX_NEGATIVE_CACHE_TTL
+    with _mx_cache_lock:
+        _mx_cache[domain] = (time.time() + ttl, result)
+        _mx_cache.move_to_end(domain)
+        while len(_mx_cache) > MX_CACHE_MAXSIZE:
+            _mx_cache.popitem(last=False)
+
+
+def load_mx_cache(path: Path = MX_CACHE_FILE) -> int:
+    """
+    Load unexpired MX results saved by save_mx_cache.
+    
+    Returns:
+        Number of domains loaded
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+    except FileNotFoundError:
+        return 0
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not load MX cache from {path}: {e}")
+        return 0
+    
+    if not isinstance(saved, dict):
+        logger.warning(f"Ignoring MX cache in {path}: expected an object")
+        return 0
+    
+    now = time.time()
+    loaded = 0
+    with _mx_cache_lock:
+        # Entries were saved least recently used first, so trimming from
+        # the front keeps the most recent ones
+        for domain, entry in saved.items():
+            try:
+                expires_at, result = entry
+                if not (isinstance(result, dict) and 'valid' in result
+                        and isinstance(result.get('issues'), list)):
+                    continue
+                if expires_at > now:
+                    _mx_cache[domain] = (float(expires_at), result)
+                    _mx_cache.move_to_end(domain)
+                    loaded += 1
+            except (TypeError, ValueError, AttributeError):
+                # Wrong shape (e.g. hand-edited file); skip the entry
+                continue
+        
+        while len(_mx_cache) > MX_CACHE_MAXSIZE:
+            _mx_cache.popitem(last=False)
+        loaded = min(loaded, len(_mx_cache))
+    
+    logger.info(f"Loaded {loaded} cached MX records")
+    return loaded
+
+
+def save_mx_cache(path: Path = MX_CACHE_FILE) -> int:
+    """
+    Save unexpired successful MX results so they survive a restart.
+    
+    Returns:
+        Number of domains saved
+    """
+    now = time.time()
+    with _mx_cache_lock:
+        saved = {
+            domain: [expires_at, result]
+            for domain, (expires_at, result) in _mx_cache.items()
+            if result['valid'] and expires_at > now
+        }
+    
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(saved, f)
+        tmp_path.replace(path)
+    except OSError as e:
+        logger.warning(f"Could not save MX cache to {path}: {e}")
+        return 0
+    
+    return len(saved)
+
 
 class EmailValidator:
     """
@@ -29,6 +161,15 @@ class EmailValidator:
         r'(?:\.[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*$'
     )
     
+    # Suspicious local parts (matched against the lower-cased address),
+    # one alternation so each email costs a single match
+    SUSPICIOUS_REGEX = re.compile(
+        r'^(?:test\d*@|example\d*@|admin@(?!real)|no-?reply@|spam@|fake@)'
+    )
+    
+    # Characters allowed in a domain label (letters, digits, hyphen)
+    LABEL_CHARS = frozenset(string.ascii_letters + string.digits + '-')
+    
     # Valid TLDs (top-level domains) - common ones
     VALID_TLDS = {
         # Generic TLDs
@@ -46,6 +187,13 @@ class EmailValidator:
         'my', 'ph', 'id', 'vn', 'pk', 'eg', 'ng', 'ke', 'gh',
     }
     
+    # Confidence labels; a score at or above a cutoff moves up one label
+    CONFIDENCE_CUTOFFS = (25, 50, 75, 90)
+    CONFIDENCE_LABELS = ("Very Low", "Low", "Medium", "High", "Very High")
+    
+    # Only results at least this confident get the DNS/MX check
+    MX_CHECK_MIN_CONFIDENCE = 50
+    
     def __init__(self, enable_dns: Optional[bool] = None):
         """
         Initialize the email validator.
@@ -55,18 +203,59 @@ class EmailValidator:
         """
         self.enable_dns = enable_dns if enable_dns is not None else ENABLE_DNS_LOOKUP
         self.dns_timeout = DNS_TIMEOUT
+        self._email_match = self.EMAIL_REGEX.match
     
-    def validate(self, email: str) -> dict:
+    def validate(self, email: str, check_mx: bool = True) -> dict:
         """
         Validate an email address with multiple checks.
         
         Args:
             email: The email address to validate
+            check_mx: Apply the DNS/MX check (see apply_mx_check); False gives
+                a result that depends only on the address and can be cached
             
         Returns:
             Dictionary with validation results and confidence score
         """
-        result = {
+        # Private copy of the cached result, since the MX check and callers
+        # may modify it
+        result = self._validate_offline(email)
+        details = result['details']
+        result = {**result, 'details': {**details, 'issues': list(details['issues'])}}
+        return self.apply_mx_check(result) if check_mx else result
+    
+    @lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+    def _validate_offline(self, email: str) -> dict:
+        """
+        Run every check except DNS/MX (cached per address).
+        
+        The result depends only on the address, so it is safe to keep; MX
+        outcomes have their own TTL cache and are applied on top by validate().
+        """
+        result = self._new_result(email)
+        
+        if not email:
+            result['details']['issues'].append('Empty email')
+            return result
+        
+        # Length check (RFC 5321 path limit) before any parsing
+        if len(email) > 254:
+            result['details']['issues'].append('Email too long (max 254 chars)')
+            return result
+        
+        # Extract domain
+        try:
+            local_part, domain = email.rsplit('@', 1)
+        except ValueError:
+            result['details']['issues'].append('Invalid format - no @ symbol')
+            return result
+        
+        return self._score(result, email, local_part, domain)
+    
+    @staticmethod
+    def _new_result(email: str) -> dict:
+        """Create an empty validation result for an email."""
+        return {
             'email': email,
             'is_valid': False,
             'confidence': 0.0,
@@ -80,31 +269,36 @@ class EmailValidator:
                 'issues': []
             }
         }
-        
-        if not email:
-            result['details']['issues'].append('Empty email')
-            return result
-        
-        # Extract domain
-        try:
-            local_part, domain = email.rsplit('@', 1)
-            result['domain'] = domain.lower()
-        except ValueError:
-            result['details']['issues'].append('Invalid format - no @ symbol')
+    
+    @lru_cache(maxsize=DOMAIN_CHECK_CACHE_SIZE)
+    def _check_domain_level(self, domain: str) -> tuple:
+        """
+        Run the checks that depend only on the (lower-cased) domain, not the
+        local part (cached, so every email at a domain shares one result).
+        """
+        return (
+            self._validate_domain(domain),
+            self._validate_tld(domain.rpartition('.')[2].lower()),
+            domain.lower() in KNOWN_VALID_DOMAINS,
+        )
+    
+    def _score(self, result: dict, email: str, local_part: str, domain: str) -> dict:
+        """Fill in and score a validation result from per-email and domain checks."""
+        domain_key = domain.lower()
+        result['domain'] = domain_key
+        
+        # 1. Syntax validation (30 points); a malformed address can never be
+        # valid, so skip the remaining checks and leave its confidence at 0
+        syntax_check = self._validate_syntax(email, local_part, domain)
+        if not syntax_check['valid']:
+            result['details']['issues'].extend(syntax_check['issues'])
             return result
+        result['details']['syntax_valid'] = True
+        confidence = 30.0
         
-        confidence = 0.0
-        
-        # 1. Syntax validation (30 points)
-        syntax_check = self._validate_syntax(email)
-        result['details']['syntax_valid'] = syntax_check['valid']
-        if syntax_check['valid']:
-            confidence += 30
-        else:
-            result['details']['issues'].extend(syntax_check['issues'])
+        domain_check, tld_check, known_domain = self._check_domain_level(domain_key)
         
         # 2. Domain structure validation (20 points)
-        domain_check = self._validate_domain(domain)
         result['details']['domain_valid'] = domain_check['valid']
         if domain_check['valid']:
             confidence += 20
@@ -112,7 +306,6 @@ class EmailValidator:
             result['details']['issues'].extend(domain_check['issues'])
         
         # 3. TLD validation (15 points)
-        tld_check = self._validate_tld(domain)
         result['details']['tld_valid'] = tld_check['valid']
         if tld_check['valid']:
             confidence += 15
@@ -128,20 +321,14 @@ class EmailValidator:
             result['details']['issues'].extend(blacklist_check['issues'])
         
         # 5. Known domain bonus (10 points)
-        if domain.lower() in KNOWN_VALID_DOMAINS:
+        if known_domain:
             confidence += 10
         
-        # 6. DNS/MX lookup (10 points, optional)
-        if self.enable_dns and confidence >= 50:  # Only check if likely valid
-            mx_check = self._check_mx_record(domain)
-            result['details']['mx_exists'] = mx_check['valid']
-            if mx_check['valid']:
-                confidence += 10
-            elif mx_check['valid'] is False:  # Explicitly failed (not just skipped)
-                confidence -= 5
-                result['details']['issues'].append('No MX record found')
-        
-        # Set final confidence and validity
+        return self._finish(result, confidence)
+    
+    @staticmethod
+    def _finish(result: dict, confidence: float) -> dict:
+        """Set the final confidence and validity of a result."""
         result['confidence'] = min(100, max(0, confidence))
         result['is_valid'] = (
             result['details']['syntax_valid'] and 
@@ -149,23 +336,34 @@ class EmailValidator:
             result['details']['not_blacklisted'] and
             confidence >= 50
         )
-        
         return result
     
-    def _validate_syntax(self, email: str) -> dict:
-        """Validate email syntax using regex."""
-        result = {'valid': False, 'issues': []}
+    def apply_mx_check(self, result: dict) -> dict:
+        """
+        Add the DNS/MX check (10 points, optional) to a validate(check_mx=False)
+        result, in place.
         
-        # Length checks
-        if len(email) > 254:
-            result['issues'].append('Email too long (max 254 chars)')
+        Lookups go through the TTL'd MX cache, so callers that cache the
+        DNS-free result should still call this every time.
+        """
+        confidence = result['confidence']
+        # Only check if likely valid
+        if not self.enable_dns or confidence < self.MX_CHECK_MIN_CONFIDENCE:
             return result
         
-        try:
-            local_part, domain = email.rsplit('@', 1)
-        except ValueError:
-            result['issues'].append('Missing @ symbol')
-            return result
+        mx_check = self._check_mx_record(result['domain'])
+        result['details']['mx_exists'] = mx_check['valid']
+        if mx_check['valid']:
+            confidence += 10
+        elif mx_check['valid'] is False:  # Explicitly failed (not just skipped)
+            confidence -= 5
+            result['details']['issues'].append('No MX record found')
+        
+        return self._finish(result, confidence)
+    
+    def _validate_syntax(self, email: str, local_part: str, domain: str) -> dict:
+        """Validate email syntax using regex (email already split and length-checked)."""
+        result = {'valid': False, 'issues': []}
         
         # Local part checks
         if not local_part:
@@ -184,14 +382,29 @@ class EmailValidator:
             result['issues'].append('Local part contains consecutive dots')
             return result
         
-        # Regex check
-        if not self.EMAIL_REGEX.match(email):
+        # Plain ASCII alphanumeric local parts (the common case) cannot fail
+        # the local half of the regex, so only the domain labels need checking
+        if local_part.isascii() and local_part.isalnum():
+            well_formed = self._labels_valid(domain)
+        else:
+            well_formed = self._email_match(email) is not None
+        
+        if not well_formed:
             result['issues'].append('Invalid characters or format')
             return result
         
         result['valid'] = True
         return result
     
+    def _labels_valid(self, domain: str) -> bool:
+        """Check dot-separated labels the same way EMAIL_REGEX does."""
+        for label in domain.split('.'):
+            if (not label or len(label) > 63
+                    or label[0] == '-' or label[-1] == '-'
+                    or not self.LABEL_CHARS.issuperset(label)):
+                return False
+        return True
+    
     def _validate_domain(self, domain: str) -> dict:
         """Validate domain structure."""
         result = {'valid': False, 'issues': []}
@@ -227,18 +440,20 @@ class EmailValidator:
                 return result
             
             # Must be alphanumeric with hyphens
-            if not re.match(r'^[a-zA-Z0-9-]+$', label):
+            if not self.LABEL_CHARS.issuperset(label):
                 result['issues'].append(f'Invalid characters in label: {label}')
                 return result
         
         result['valid'] = True
         return result
     
-    def _validate_tld(self, domain: str) -> dict:
-        """Validate top-level domain."""
-        result = {'valid': False, 'issues': []}
+    def _validate_tld(self, tld: str) -> dict:
+        """Validate a (lower-cased) top-level domain."""
+        # Known TLDs pass every check below
+        if tld in self.VALID_TLDS:
+            return {'valid': True, 'issues': []}
         
-        tld = domain.split('.')[-1].lower()
+        result = {'valid': False, 'issues': []}
         
         if not tld:
             result['issues'].append('Empty TLD')
@@ -253,10 +468,8 @@ class EmailValidator:
             result['issues'].append('TLD cannot be all numbers')
             return result
         
-        # Check against known TLDs (not strict - allow unknown TLDs with warning)
-        if tld not in self.VALID_TLDS:
-            # Still valid, but might be less common
-            result['issues'].append(f'Uncommon TLD: .{tld}')
+        # Not a known TLD (not strict - allow unknown TLDs with warning)
+        result['issues'].append(f'Uncommon TLD: .{tld}')
         
         result['valid'] = True
         return result
@@ -269,72 +482,72 @@ class EmailValidator:
         domain_lower = domain.lower()
         
         # Check email blacklist
-        if email_lower in [e.lower() for e in EMAIL_BLACKLIST]:
+        if email_lower in EMAIL_BLACKLIST:
             result['valid'] = False
             result['issues'].append('Email is blacklisted')
             return result
         
-        # Check domain blacklist
-        if domain_lower in [d.lower() for d in DOMAIN_BLACKLIST]:
+        # Check domain blacklist (subdomains of a listed domain match too)
+        if is_blacklisted_domain(domain_lower):
             result['valid'] = False
             result['issues'].append(f'Domain is blacklisted: {domain}')
             return result
         
         # Check for suspicious patterns
-        suspicious_patterns = [
-            r'^test\d*@',
-            r'^example\d*@',
-            r'^admin@(?!real)',
-            r'^no-?reply@',
-            r'^spam@',
-            r'^fake@',
-        ]
-        
-        for pattern in suspicious_patterns:
-            if re.match(pattern, email_lower):
-                result['issues'].append('Suspicious email pattern')
-                # Don't invalidate, just note it
-                break
+        if self.SUSPICIOUS_REGEX.match(email_lower):
+            result['issues'].append('Suspicious email pattern')
+            # Don't invalidate, just note it
         
         return result
     
-    @lru_cache(maxsize=1000)
     def _check_mx_record(self, domain: str) -> dict:
-        """Check if domain has MX records (cached)."""
+        """Check if domain has MX records (cached with a TTL)."""
+        domain = domain.lower()
+        result = _mx_cache_get(domain)
+        if result is None:
+            result = self._lookup_mx_record(domain)
+            _mx_cache_put(domain, result)
+        return result
+    
+    def _lookup_mx_record(self, domain: str) -> dict:
+        """Resolve MX records for a domain, falling back to an A record."""
         result = {'valid': None, 'issues': []}
         
+        if dns is None:
+            # dnspython not installed
+            result['issues'].append('DNS lookup unavailable')
+            logger.debug("dnspython not installed, skipping MX check")
+            return result
+        
         try:
-            import dns.resolver
-            
-            resolver = dns.resolver.Resolver()
-            resolver.timeout = self.dns_timeout
-            resolver.lifetime = self.dns_timeout
+            resolver = _get_resolver(self.dns_timeout)
             
             try:
                 mx_records = resolver.resolve(domain, 'MX')
                 if mx_records:
                     result['valid'] = True
                     return result
-            except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN):
-                # Try A record as fallback
-                try:
-                    a_records = resolver.resolve(domain, 'A')
-                    if a_records:
-                        result['valid'] = True
-                        result['issues'].append('No MX record, but A record exists')
-                        return result
-                except:
-                    pass
+            except dns.resolver.NXDOMAIN:
+                # The domain does not exist, so an A lookup cannot succeed
+                result['valid'] = False
+                result['issues'].append('Domain has no mail server')
+                return result
+            except dns.resolver.NoAnswer:
+                pass
+            
+            # Try A record as fallback
+            try:
+                a_records = resolver.resolve(domain, 'A')
+                if a_records:
+                    result['valid'] = True
+                    result['issues'].append('No MX record, but A record exists')
+                    return result
+            except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN, dns.exception.Timeout):
+                pass
             
             result['valid'] = False
             result['issues'].append('Domain has no mail server')
             
-        except ImportError:
-            # dnspython not installed
-            result['valid'] = None
-            result['issues'].append('DNS lookup unavailable')
-            logger.debug("dnspython not installed, skipping MX check")
-            
         except Exception as e:
             result['valid'] = None
             result['issues'].append(f'DNS lookup error: {str(e)}')
@@ -346,26 +559,41 @@ class EmailValidator:
         """
         Validate multiple emails.
         
+        With DNS enabled, MX records for the distinct domains that will get
+        the MX check are resolved concurrently up front.
+        
         Args:
             emails: List of email addresses
             
         Returns:
             List of validation results
         """
-        return [self.validate(email) for email in emails]
+        results = [self.validate(email, check_mx=False) for email in emails]
+        if not self.enable_dns:
+            return results
+        
+        # Only domains apply_mx_check will look up; malformed or low-scoring
+        # addresses never reach DNS
+        self._prefetch_mx_records({
+            result['domain'] for result in results
+            if result['confidence'] >= self.MX_CHECK_MIN_CONFIDENCE
+        })
+        
+        return [self.apply_mx_check(result) for result in results]
+    
+    def _prefetch_mx_records(self, domains: set[str]) -> None:
+        """Resolve MX records for the given (lower-cased) domains in parallel."""
+        if not domains:
+            return
+        
+        # Lookups mostly wait on the network, so threads overlap well
+        with ThreadPoolExecutor(max_workers=min(MX_LOOKUP_WORKERS, len(domains))) as executor:
+            for _ in executor.map(self._check_mx_record, domains):
+                pass
     
     def get_confidence_label(self, confidence: float) -> str:
         """Get a human-readable label for confidence score."""
-        if confidence >= 90:
-            return "Very High"
-        elif confidence >= 75:
-            return "High"
-        elif confidence >= 50:
-            return "Medium"
-        elif confidence >= 25:
-            return "Low"
-        else:
-            return "Very Low"
+        return self.CONFIDENCE_LABELS[bisect_right(self.CONFIDENCE_CUTOFFS, confidence)]
 
 
 # Command-line testing
@@ -0,0 +1,185 @@
+"""
+Tests for the email extractor.
+"""
+import random
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from backend.email_extractor import EmailExtractor
+
+
+class TestEmailPattern(unittest.TestCase):
+    """Matching behaviour of EMAIL_PATTERN around long character runs."""
+    
+    def setUp(self):
+        self.extractor = EmailExtractor()
+    
+    def test_email_after_dot_leader(self):
+        # Leading dots are not part of the address; a run longer than the
+        # 64-char local-part cap must not hide the email behind it
+        text = 'Sales ' + '.' * 70 + 'john@acme.com'
+        
+        self.assertEqual([m.email for m in self.extractor.extract_emails(text)],
+                         ['john@acme.com'])
+        self.assertEqual(self.extractor.extract_emails_simple(text), ['john@acme.com'])
+        # Non-ASCII text takes the str pipeline instead of the bytes one
+        self.assertEqual([m.email for m in self.extractor.extract_emails(text + ' é')],
+                         ['john@acme.com'])
+    
+    def test_overlong_local_part_is_rejected(self):
+        text = 'x' * 70 + '@acme.com'
+        self.assertEqual(self.extractor.extract_emails(text), [])
+
+
+class TestContextHints(unittest.TestCase):
+    """Context windows stop at neighbouring emails."""
+    
+    def setUp(self):
+        self.extractor = EmailExtractor()
+    
+    def hints(self, text: str) -> list:
+        return [(m.email, m.name_hint, m.company_hint)
+                for m in self.extractor.extract_emails(text)]
+    
+    def test_name_hint_not_taken_from_previous_email(self):
+        self.assertEqual(self.hints("Contact Mary Jones mary@jones.org x@y.net"), [
+            ('mary@jones.org', 'Mary Jones', 'Jones'),
+            ('x@y.net', None, None),
+        ])
+    
+    def test_company_hint_not_taken_from_neighbouring_email(self):
+        self.assertEqual(self.hints("Company: Lease Info info@lease.co john.smith@acme.com"), [
+            ('info@lease.co', 'Lease Info', 'Lease Info'),
+            ('john.smith@acme.com', None, 'Acme'),
+        ])
+    
+    def test_str_and_bytes_pipelines_agree(self):
+        text = "Company: Acme Widgets\nJane Smith: jane@acme-widgets.co.uk, Bob Stone bob@gmail.com"
+        # A non-ASCII character elsewhere forces the str pipeline
+        self.assertEqual(self.hints(text), self.hints("é " + text))
+
+
+# Mixed sample text: plain and obfuscated addresses, hints, junk and repeats
+CORPUS = [
+    "Contact us at support@example.com for help.",
+    "John Doe - john.doe@gmail.com",
+    "Email: test [at] domain [dot] com",
+    "Reach me at alice(at)company.org or bob [at] gmail [dot] com",
+    "Multiple: a@b.com, c@d.org, e@f.net",
+    "Invalid: @nodomain, noatsign.com, missing@tld",
+    "Company: Acme Widgets\nJane Smith: jane_s@acme-widgets.co.uk and again jane_s@acme-widgets.co.uk",
+    "Name: Bob Builder bob{at}builders{dot}org and x [underscore] y(at)z [dash] q.com",
+    "Dr. Who <at> nothing, who<at>tardis<dot>space; Foo Bar Inc. foo@bar-inc.com",
+    "emails: A.B@X.COM,a.b@x.com. (weird@@double.com) trailing.dot.@ex.org",
+    "Mr. Smith at home, ping me at smith dot j at mail dot com",
+    "x" * 150 + " long.context@example.net " + "y" * 150,
+    "Acme Corp. Support Team support@acmecorp.io",
+    "Sales ........ sales@shop.com\x1cfax@shop.com\x1fnext",
+]
+
+# Fragments joined at random to fuzz de-obfuscation and matching
+FRAGMENTS = [
+    'john', ' ', '  ', '\n', '\t', '[at]', '(at)', '{at}', '<at>', ' at ', '@', ' @ ',
+    '[dot]', ' dot ', '(dot)', '[underscore]', '(dash)', 'gmail', 'com', '.', 'x',
+    '[', ']', '(', 'AT', 'Dot', 'Jane Smith ', 'Company: Acme ', ', ',
+    'mary@jones.org', 'bob.stone', 'acme-co', '.net', 'info@',
+]
+
+
+def random_texts(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 16)))
+            for _ in range(count)]
+
+
+class TestPipelines(unittest.TestCase):
+    """The str and bytes pipelines give identical results on ASCII text."""
+    
+    def setUp(self):
+        self.extractor = EmailExtractor()
+    
+    @staticmethod
+    def pad(text: str, first: str) -> str:
+        # Keeps the first character out of every context window; the "|"
+        # stops de-obfuscation from merging the padding into the text
+        return first + ' ' * (2 * EmailExtractor.CONTEXT_CHARS) + '|' + text
+    
+    def via_str(self, text: str, keep_duplicates: bool) -> list:
+        # A non-ASCII character forces the str pipeline
+        padded = self.pad(text, 'é')
+        if keep_duplicates:
+            return self.extractor.extract_emails_with_duplicates(padded)
+        return self.extractor.extract_emails(padded)
+    
+    def assert_pipelines_agree(self, text: str):
+        data = self.pad(text, 'e').encode('ascii')
+        self.assertEqual(self.via_str(text, False),
+                         self.extractor.extract_emails_bytes(data), text)
+        self.assertEqual(self.via_str(text, True),
+                         self.extractor.extract_emails_bytes(data, keep_duplicates=True), text)
+    
+    def test_corpus(self):
+        for text in CORPUS:
+            self.assert_pipelines_agree(text)
+    
+    def test_random_text(self):
+        for text in random_texts(2000):
+            self.assert_pipelines_agree(text)
+    
+    def test_ascii_str_input_uses_bytes_pipeline(self):
+        for text in CORPUS:
+            self.assertEqual(self.extractor.extract_emails(text),
+                             self.extractor.extract_emails_bytes(text.encode('ascii')))
+
+
+class TestDeObfuscation(unittest.TestCase):
+    """The probe shortcuts give the same text as a full de-obfuscation pass."""
+    
+    def setUp(self):
+        self.extractor = EmailExtractor()
+    
+    def full_pass(self, text: str) -> str:
+        return self.extractor.combined_obfuscation.sub(self.extractor._replace_obfuscation, text)
+    
+    def test_examples(self):
+        self.assertEqual(self.extractor._de_obfuscate("john [at] gmail [dot] com"), "john@gmail.com")
+        self.assertEqual(self.extractor._de_obfuscate("john(at)gmail.com"), "john@gmail.com")
+        self.assertEqual(self.extractor._de_obfuscate("x [underscore] y (dash) z"), "x_y-z")
+    
+    def test_matches_full_pass(self):
+        for text in CORPUS + random_texts(5000, seed=1):
+            expected = self.full_pass(text)
+            self.assertEqual(self.extractor._de_obfuscate(text), expected, text)
+            self.assertEqual(self.extractor._de_obfuscate_bytes(text.encode('ascii')),
+                             expected.encode('ascii'), text)
+    
+    def test_probe_misses_leave_text_unchanged(self):
+        rng = random.Random(2)
+        pieces = FRAGMENTS + ['a', 't', 'd', 'o', 'Q']
+        for _ in range(5000):
+            text = ''.join(rng.choice(pieces) for _ in range(rng.randint(1, 10)))
+            if not EmailExtractor.OBFUSCATION_PROBE.search(text):
+                self.assertEqual(self.full_pass(text), text, text)
+
+
+class TestBatch(unittest.TestCase):
+    """extract_emails_batch gives the same results as per-text extraction."""
+    
+    def setUp(self):
+        self.extractor = EmailExtractor()
+        self.texts = CORPUS + random_texts(200, seed=3) + ['', 'é ' + CORPUS[0]]
+        self.expected = [self.extractor.extract_emails(text) for text in self.texts]
+    
+    def test_inline(self):
+        self.assertEqual(self.extractor.extract_emails_batch(self.texts), self.expected)
+    
+    def test_process_pool(self):
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            self.assertEqual(self.extractor.extract_emails_batch(self.texts, executor),
+                             self.expected)
+            self.assertEqual(self.extractor.extract_emails_batch(self.texts[:1], executor),
+                             self.expected[:1])
+
+
+if __name__ == '__main__':
+    unittest.main()
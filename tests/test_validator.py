@@ -0,0 +1,185 @@
+"""
+Tests for the email validator.
+"""
+import json
+import random
+import string
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from backend import validator
+from backend.validator import EmailValidator, load_mx_cache
+
+
+class FakeClock:
+    """Stands in for time.time() inside backend.validator."""
+    
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSyntaxFastPath(unittest.TestCase):
+    """Alphanumeric local parts skip EMAIL_REGEX without changing results."""
+    
+    def setUp(self):
+        self.validator = EmailValidator(enable_dns=False)
+        self.rng = random.Random(0)
+    
+    def random_domain(self) -> str:
+        chars = string.ascii_letters + string.digits + '-._'
+        return ''.join(self.rng.choice(chars) for _ in range(self.rng.randint(0, 20)))
+    
+    def test_alphanumeric_local_parts(self):
+        chars = string.ascii_letters + string.digits + 'é'
+        for _ in range(20000):
+            local_part = ''.join(self.rng.choice(chars) for _ in range(self.rng.randint(1, 64)))
+            domain = self.random_domain()
+            email = f"{local_part}@{domain}"
+            result = self.validator._validate_syntax(email, local_part, domain)
+            self.assertEqual(result['valid'], EmailValidator.EMAIL_REGEX.match(email) is not None,
+                             email)
+    
+    def test_long_labels(self):
+        for length in (62, 63, 64):
+            domain = 'a' * length + '.com'
+            email = f"john@{domain}"
+            result = self.validator._validate_syntax(email, 'john', domain)
+            self.assertEqual(result['valid'], EmailValidator.EMAIL_REGEX.match(email) is not None)
+
+
+class TestMXCache(unittest.TestCase):
+    """MX results expire after their TTL and are not pinned by other caches."""
+    
+    def setUp(self):
+        validator._mx_cache.clear()
+        self.addCleanup(validator._mx_cache.clear)
+        
+        self.clock = FakeClock()
+        patcher = mock.patch.object(validator.time, 'time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        
+        self.validator = EmailValidator(enable_dns=True)
+        self.lookups = []
+        self.mx_valid = True
+        patcher = mock.patch.object(self.validator, '_lookup_mx_record', self.lookup)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def lookup(self, domain: str) -> dict:
+        self.lookups.append(domain)
+        if self.mx_valid:
+            return {'valid': True, 'issues': []}
+        return {'valid': False, 'issues': ['Domain has no mail server']}
+    
+    def test_positive_result_expires_after_ttl(self):
+        self.validator._check_mx_record('Acme.com')
+        self.validator._check_mx_record('acme.com')
+        self.assertEqual(self.lookups, ['acme.com'])
+        
+        self.clock.now += validator.MX_CACHE_TTL - 1
+        self.validator._check_mx_record('acme.com')
+        self.assertEqual(len(self.lookups), 1)
+        
+        self.clock.now += 1
+        self.validator._check_mx_record('acme.com')
+        self.assertEqual(len(self.lookups), 2)
+    
+    def test_negative_result_uses_shorter_ttl(self):
+        self.assertLess(validator.MX_NEGATIVE_CACHE_TTL, validator.MX_CACHE_TTL)
+        self.mx_valid = False
+        self.validator._check_mx_record('nomail.com')
+        
+        self.clock.now += validator.MX_NEGATIVE_CACHE_TTL - 1
+        self.validator._check_mx_record('nomail.com')
+        self.assertEqual(len(self.lookups), 1)
+        
+        self.clock.now += 1
+        self.validator._check_mx_record('nomail.com')
+        self.assertEqual(len(self.lookups), 2)
+    
+    def test_validate_picks_up_expired_mx_result(self):
+        first = self.validator.validate('john@acme-widgets.com')
+        self.assertNotIn('No MX record found', first['details']['issues'])
+        
+        # The DNS-free part stays cached, but the MX outcome is re-applied
+        self.mx_valid = False
+        self.clock.now += validator.MX_CACHE_TTL
+        second = self.validator.validate('john@acme-widgets.com')
+        self.assertIn('No MX record found', second['details']['issues'])
+        self.assertLess(second['confidence'], first['confidence'])
+        self.assertEqual(len(self.lookups), 2)
+    
+    def test_cached_results_are_not_shared(self):
+        result = self.validator.validate('john@acme-widgets.com')
+        result['details']['issues'].append('changed by caller')
+        self.assertNotIn('changed by caller',
+                         self.validator.validate('john@acme-widgets.com')['details']['issues'])
+    
+    def test_batch_matches_single_validation(self):
+        emails = ['john@acme-widgets.com', 'JOHN@Acme-Widgets.com', 'test@test.com',
+                  'bad..email@domain.com', 'invalid@', '', 'x@nomail.org']
+        batch = self.validator.validate_batch(emails)
+        self.assertEqual(batch, [self.validator.validate(email) for email in emails])
+        # One lookup per distinct domain that gets the MX check, shared by the
+        # prefetch and validate; bad..email@domain.com fails syntax, so
+        # domain.com is never looked up
+        self.assertNotIn('domain.com', self.lookups)
+        self.assertEqual(sorted(self.lookups), ['acme-widgets.com', 'nomail.org', 'test.com'])
+
+
+class TestLoadMXCache(unittest.TestCase):
+    """load_mx_cache skips malformed entries and respects MX_CACHE_MAXSIZE."""
+    
+    def setUp(self):
+        validator._mx_cache.clear()
+        self.addCleanup(validator._mx_cache.clear)
+        
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / 'mx_cache.json'
+    
+    def load(self, saved) -> int:
+        self.path.write_text(json.dumps(saved), encoding='utf-8')
+        return load_mx_cache(self.path)
+    
+    def test_missing_or_malformed_file(self):
+        self.assertEqual(load_mx_cache(self.path), 0)
+        with self.assertLogs(validator.logger, 'WARNING'):
+            self.path.write_text('{not json', encoding='utf-8')
+            self.assertEqual(load_mx_cache(self.path), 0)
+        with self.assertLogs(validator.logger, 'WARNING'):
+            self.assertEqual(self.load([1, 2, 3]), 0)
+    
+    def test_malformed_entries_are_skipped(self):
+        future = validator.time.time() + 3600
+        good = {'valid': True, 'issues': []}
+        loaded = self.load({
+            'good.com': [future, good],
+            'expired.com': [1.0, good],
+            'short.com': [future],
+            'null.com': None,
+            'number.com': 5,
+            'string-expiry.com': ['soon', good],
+            'no-issues.com': [future, {'valid': True}],
+            'not-a-dict.com': [future, 'valid'],
+        })
+        self.assertEqual(loaded, 1)
+        self.assertEqual(list(validator._mx_cache), ['good.com'])
+    
+    def test_trimmed_to_maxsize(self):
+        future = validator.time.time() + 3600
+        saved = {f"d{i}.com": [future, {'valid': True, 'issues': []}] for i in range(10)}
+        with mock.patch.object(validator, 'MX_CACHE_MAXSIZE', 4):
+            self.assertEqual(self.load(saved), 4)
+        # The most recently used (last saved) entries are kept
+        self.assertEqual(list(validator._mx_cache), ['d6.com', 'd7.com', 'd8.com', 'd9.com'])
+
+
+if __name__ == '__main__':
+    unittest.main()